@@ -5,7 +5,9 @@ Provides time-aligned access to captured events with associated screenshots.
 
 from __future__ import annotations
 
+import sqlite3
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Iterator
 
@@ -49,6 +51,27 @@ class InvalidCaptureEvent(ValueError):
     """A stored input event lacks the data required for deterministic replay."""
 
 
+# ActionEvent columns raw_events() reads; see _convert_action_event
+_ACTION_EVENT_COLUMNS = (
+    "name",
+    "timestamp",
+    "mouse_x",
+    "mouse_y",
+    "mouse_dx",
+    "mouse_dy",
+    "mouse_button_name",
+    "mouse_pressed",
+    "key_name",
+    "key_char",
+    "key_vk",
+    "canonical_key_name",
+    "canonical_key_char",
+    "canonical_key_vk",
+    "structural_observation",
+    "disabled",
+)
+
+
 def _parse_structural_observation(raw: object) -> StructuralObservation | None:
     """Load optional structural evidence without breaking legacy recordings."""
 
@@ -93,11 +116,31 @@ def _require_key_identity(db_event) -> None:
         )
 
 
+@cache
+def _action_events_select():
+    """Build the Core SELECT behind raw_events() (once, on first use).
+
+    Plain rows skip ORM identity-map and instance construction; they expose
+    the same attribute names that _convert_action_event reads.
+    """
+    import sqlalchemy as sa
+
+    from openadapt_capture.db.models import ActionEvent
+
+    columns = ActionEvent.__table__.c
+    return (
+        sa.select(*(columns[name] for name in _ACTION_EVENT_COLUMNS))
+        .where(columns.recording_id == sa.bindparam("recording_id"))
+        .order_by(columns.timestamp, columns.id)
+    )
+
+
 def _convert_action_event(db_event) -> PydanticActionEvent:
-    """Convert a SQLAlchemy ActionEvent to a Pydantic event.
+    """Convert a stored action event to a Pydantic event.
 
     Args:
-        db_event: SQLAlchemy ActionEvent instance.
+        db_event: SQLAlchemy ActionEvent instance or a row selected by
+            _action_events_select().
 
     Returns:
         A validated Pydantic event.
@@ -479,11 +522,15 @@ class CaptureSession:
     ) -> None:
         """Initialize capture session.
 
-        Use CaptureSession.load() instead of calling this directly.
+        Use CaptureSession.load() or from_session() instead of calling this
+        directly.
         """
         self.capture_dir = Path(capture_dir)
         self._session = session
         self._recording = recording
+        # Encoded viewer frames, keyed by (timestamp, scale, quality, format);
+        # filled by visualize.create_html so repeat renders skip decode/encode
+        self._jpeg_cache: dict[tuple, bytes] = {}
 
     @classmethod
     def load(cls, capture_dir: str | Path) -> "CaptureSession":
@@ -496,7 +543,8 @@ class CaptureSession:
             CaptureSession instance.
 
         Raises:
-            FileNotFoundError: If capture doesn't exist.
+            FileNotFoundError: If capture doesn't exist or recording.db is
+                not a SQLite database.
         """
         capture_dir = Path(capture_dir)
         db_path = capture_dir / "recording.db"
@@ -504,10 +552,54 @@ class CaptureSession:
         if not db_path.exists():
             raise FileNotFoundError(f"Capture not found: {capture_dir}")
 
+        # Probe the header with plain sqlite3 first, so a file that is not a
+        # database fails before an engine and pool are built around it
+        try:
+            probe = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                probe.execute("PRAGMA schema_version").fetchone()
+            finally:
+                probe.close()
+        except sqlite3.OperationalError:
+            # Locked, unreadable, etc.: leave it to the engine to report
+            pass
+        except sqlite3.DatabaseError as exc:
+            raise FileNotFoundError(
+                f"Invalid capture (not a SQLite database): {capture_dir}"
+            ) from exc
+
         from openadapt_capture.db import get_session_for_path
-        from openadapt_capture.db.models import Recording
 
         session = get_session_for_path(str(db_path))
+        return cls.from_session(session, capture_dir=capture_dir)
+
+    @classmethod
+    def from_session(
+        cls,
+        session,
+        recording_id: int | None = None,
+        capture_dir: str | Path | None = None,
+    ) -> "CaptureSession":
+        """Wrap an already-open session on a capture database.
+
+        Lets a caller that has just written a recording read it back without
+        building a second engine. The capture takes ownership of the
+        session: close() closes it and disposes its engine.
+
+        Args:
+            session: SQLAlchemy session bound to a recording.db.
+            recording_id: Recording to load. Defaults to the first one.
+            capture_dir: Capture directory. Defaults to the directory of the
+                session's database file.
+
+        Returns:
+            CaptureSession instance.
+
+        Raises:
+            FileNotFoundError: If the database holds no matching recording.
+            ValueError: If capture_dir is omitted for an in-memory database.
+        """
+        from openadapt_capture.db.models import Recording
 
         def _discard_session() -> None:
             # Close the session AND dispose its engine: the pool otherwise
@@ -518,8 +610,22 @@ class CaptureSession:
             if bind is not None:
                 bind.dispose()
 
+        if capture_dir is None:
+            try:
+                database = session.get_bind().url.database
+            except Exception:
+                _discard_session()
+                raise
+            if not database or database == ":memory:":
+                _discard_session()
+                raise ValueError("capture_dir is required for an in-memory database")
+            capture_dir = Path(database).parent
+
         try:
-            recording = session.query(Recording).first()
+            query = session.query(Recording)
+            if recording_id is not None:
+                query = query.filter(Recording.id == recording_id)
+            recording = query.first()
         except Exception:
             _discard_session()
             raise
@@ -659,6 +765,11 @@ class CaptureSession:
                 return float(ts)
         return None
 
+    @property
+    def video_start_time(self) -> float:
+        """Timestamp of the first video frame (recording start if not stored)."""
+        return self._recording.video_start_time or self._recording.timestamp
+
     def raw_events(self) -> list[PydanticActionEvent]:
         """Get all raw action events (unprocessed).
 
@@ -667,12 +778,10 @@ class CaptureSession:
         Returns:
             List of raw mouse and keyboard events.
         """
-        events = []
-        for db_event in self._recording.action_events:
-            if getattr(db_event, "disabled", False):
-                continue
-            events.append(_convert_action_event(db_event))
-        return events
+        rows = self._session.execute(
+            _action_events_select(), {"recording_id": self._recording.id}
+        )
+        return [_convert_action_event(row) for row in rows if not row.disabled]
 
     def actions(self, include_moves: bool = False) -> Iterator[Action]:
         """Iterate over processed actions.
@@ -739,8 +848,7 @@ class CaptureSession:
             from openadapt_capture.video import extract_frame
 
             # Convert to video-relative timestamp
-            video_start = self._recording.video_start_time or self._recording.timestamp
-            video_timestamp = timestamp - video_start
+            video_timestamp = timestamp - self.video_start_time
 
             if video_timestamp < 0:
                 video_timestamp = 0
@@ -3,6 +3,8 @@
 Copied from legacy OpenAdapt db/db.py, adapted for per-capture databases.
 """
 
+import os
+
 import sqlalchemy as sa
 from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
@@ -116,7 +118,8 @@ def migrate_missing_columns(engine: sa.engine) -> None:
 def create_db(db_path: str, echo: bool = False) -> tuple:
     """Create a new database at the given path, returning (engine, Session).
 
-    Creates all tables defined in the models.
+    Creates the parent directory if needed, then all tables defined in the
+    models.
 
     Args:
         db_path: Path to the SQLite database file.
@@ -125,6 +128,7 @@ def create_db(db_path: str, echo: bool = False) -> tuple:
     Returns:
         tuple of (engine, Session class).
     """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
     db_url = f"sqlite:///{db_path}"
     engine = get_engine(db_url, echo=echo)
 
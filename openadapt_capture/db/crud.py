@@ -5,6 +5,7 @@ Only import paths are changed; function signatures and logic are identical.
 """
 
 import json
+from collections import namedtuple
 from typing import Any, TypeVar
 
 import sqlalchemy as sa
@@ -100,6 +101,37 @@ def insert_action_event(
     _insert(session, event_data, ActionEvent, action_events)
 
 
+def insert_action_events(
+    session: SaSession,
+    recording: Recording,
+    events: list[tuple[int, dict[str, Any]]],
+) -> None:
+    """Insert several action events with one INSERT and one commit.
+
+    Args:
+        session (sa.orm.Session): The database session.
+        recording (Recording): The recording object.
+        events (list): (timestamp, event data) pairs, as would be passed
+            to insert_action_event one at a time.
+    """
+    columns = [column.name for column in ActionEvent.__table__.columns]
+    rows = []
+    for event_timestamp, event_data in events:
+        event_data = {
+            **event_data,
+            "timestamp": event_timestamp,
+            "recording_id": recording.id,
+            "recording_timestamp": recording.timestamp,
+        }
+        row = {column: event_data.pop(column, None) for column in columns}
+        # make sure all event data was saved
+        assert not event_data, event_data
+        rows.append(row)
+    if rows:
+        session.execute(sa.insert(ActionEvent), rows)
+        session.commit()
+
+
 def insert_screenshot(
     session: SaSession,
     recording: Recording,
@@ -235,6 +267,28 @@ def insert_recording(session: SaSession, recording_data: dict) -> Recording:
     return db_obj
 
 
+RecordingRow = namedtuple("RecordingRow", "id timestamp")
+
+
+def insert_recording_core(session: SaSession, recording_data: dict) -> RecordingRow:
+    """Insert the recording with a Core INSERT, without building an ORM object.
+
+    For callers that only need the new row's id and timestamp (e.g. to pass
+    on to the insert_*_event functions), this skips the unit of work and
+    the refresh SELECT that insert_recording pays.
+
+    Args:
+        session (sa.orm.Session): The database session.
+        recording_data (dict): The data of the recording.
+
+    Returns:
+        RecordingRow: The id and timestamp of the inserted recording.
+    """
+    result = session.execute(sa.insert(Recording).values(**recording_data))
+    session.commit()
+    return RecordingRow(result.inserted_primary_key[0], recording_data["timestamp"])
+
+
 def _get(
     session: SaSession,
     table: BaseModelType,
@@ -388,10 +388,14 @@ class ScreenCapturer:
         from PIL import Image
 
         if sys.platform == "win32":
-            import mss.windows
+            # The BitBlt flag lives in mss.windows.gdi since mss 10
+            try:
+                import mss.windows.gdi as mss_windows
+            except ImportError:
+                import mss.windows as mss_windows
             # Fix cursor flicker on Windows (from legacy OpenAdapt)
             # https://github.com/BoboTiG/python-mss/issues/179#issuecomment-673292002
-            mss.windows.CAPTUREBLT = 0
+            mss_windows.CAPTUREBLT = 0
 
         sct = mss.mss()
         monitor = sct.monitors[0]  # All monitors combined
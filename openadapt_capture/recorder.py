@@ -2478,6 +2478,26 @@ class Recorder:
         self.check_health()
         return self._ready_event.is_set()
 
+    def wait_for_events(
+        self, min_count: int, timeout: float = 60, poll_interval: float = 0.05
+    ) -> bool:
+        """Block until at least ``min_count`` action events have been recorded.
+
+        The counter is shared with the writer processes, so it is polled
+        rather than signalled; the wait also ends early if recording stops.
+
+        Returns True if the count was reached, False on stop or timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while self._num_action_events.value < min_count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopped_event.wait(
+                min(poll_interval, remaining)
+            ):
+                break
+        self.check_health()
+        return self._num_action_events.value >= min_count
+
     @property
     def is_recording(self) -> bool:
         """Whether recording is currently active."""
@@ -18,11 +18,15 @@ from PIL import Image
 from openadapt_capture.x11_threads import ensure_xlib_thread_support
 
 if sys.platform == "win32":
-    import mss.windows
+    # The BitBlt flag lives in mss.windows.gdi since mss 10
+    try:
+        import mss.windows.gdi as mss_windows
+    except ImportError:
+        import mss.windows as mss_windows
 
     # fix cursor flicker on windows; see:
     # https://github.com/BoboTiG/python-mss/issues/179#issuecomment-673292002
-    mss.windows.CAPTUREBLT = 0
+    mss_windows.CAPTUREBLT = 0
 
 
 # TODO: move to constants.py
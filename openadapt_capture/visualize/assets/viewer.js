@@ -0,0 +1,1013 @@
+// Capture viewer. Expects frameData, eventData and the other constants
+// emitted by openadapt_capture.visualize.html in a preceding <script>.
+
+// Events are embedded with short keys, millisecond times and no empty
+// fields (see _compact_event), and frames as bare images sharing the
+// event times; restore the full shape
+function expandFrames(raw, events) {
+    return raw.map((image, index) => ({ index, time: events[index].time, image }));
+}
+
+function expandEvents(raw) {
+    const names = { t: 'time', e: 'type', tx: 'text', k: 'keys', b: 'button' };
+    return raw.map((e, index) => {
+        const event = { index };
+        for (const key in e) event[names[key] || key] = e[key];
+        event.time /= 1000;
+        return event;
+    });
+}
+
+const events = expandEvents(eventData);
+const frames = expandFrames(frameData, events);
+
+// Display strings per event. Every list row needs the time and type
+// class, so those are computed up front; the details markup and copy text
+// are built the first time an event needs them.
+const eventMeta = events.map(event => ({
+    timeStr: formatTime(event.time),
+    typeClass: getTypeClass(event.type),
+    detailsHTML: null,
+    copyText: null,
+}));
+
+// State
+let currentIndex = 0;
+let isPlaying = false;
+let playFrame = 0;
+let showOverlay = true;
+
+// Elements
+const frameContainer = document.getElementById('frame-container');
+const frameCanvas = document.getElementById('frame-canvas');
+const frameVideo = document.getElementById('frame-video');
+const frameTime = document.getElementById('frame-time');
+const currentTimeEl = document.getElementById('current-time');
+const timelineProgress = document.getElementById('timeline-progress');
+const timelineMarkers = document.getElementById('timeline-markers');
+const eventsList = document.getElementById('events-list');
+const detailsContent = document.getElementById('details-content');
+const btnPlay = document.getElementById('btn-play');
+const btnOverlay = document.getElementById('btn-overlay');
+const btnCopy = document.getElementById('copy-btn');
+const btnCopyAll = document.getElementById('copy-all-btn');
+const audio = document.getElementById('audio');
+const transcriptContent = document.getElementById('transcript-content');
+const stepCounter = document.getElementById('step-counter');
+const stepPrev = document.getElementById('step-prev');
+const stepNext = document.getElementById('step-next');
+
+// Current event for copying
+let currentEvent = null;
+
+// Long recordings can have thousands of events and transcript segments, so
+// both lists keep only the rows intersecting their scroll viewport in the
+// DOM. Rows share a fixed height and are recycled from a pool as they
+// scroll out of view.
+const VIRTUAL_OVERSCAN = 6;
+
+function createVirtualList(container, count, estimatedHeight, createRow, fillRow) {
+    const spacer = document.createElement('div');
+    spacer.className = 'virtual-spacer';
+    container.appendChild(spacer);
+
+    const pool = [];
+    const rendered = new Map();
+    const paddingTop = parseFloat(getComputedStyle(container).paddingTop) || 0;
+    let activeIndex = -1;
+    let pending = 0;
+    // Track the scroll position and viewport height ourselves so
+    // scrollToIndex never has to read layout after a class toggle
+    let scrollTop = container.scrollTop;
+    let viewHeight = container.clientHeight;
+
+    // Measure a real row so the spacer matches the stylesheet
+    let rowHeight = estimatedHeight;
+    if (count > 0) {
+        const probe = spacer.appendChild(createRow());
+        fillRow(probe, 0);
+        const margin = parseFloat(getComputedStyle(probe).marginBottom) || 0;
+        rowHeight = probe.offsetHeight + margin || estimatedHeight;
+        probe.hidden = true;
+        pool.push(probe);
+    }
+    spacer.style.height = (count * rowHeight) + 'px';
+
+    function render() {
+        pending = 0;
+        const top = scrollTop - paddingTop;
+        const first = Math.max(0, Math.floor(top / rowHeight) - VIRTUAL_OVERSCAN);
+        const last = Math.min(count, Math.ceil((top + viewHeight) / rowHeight) + VIRTUAL_OVERSCAN);
+
+        for (const [i, row] of rendered) {
+            if (i < first || i >= last) {
+                row.hidden = true;
+                rendered.delete(i);
+                pool.push(row);
+            }
+        }
+        for (let i = first; i < last; i++) {
+            if (rendered.has(i)) continue;
+            const row = pool.pop() || spacer.appendChild(createRow());
+            row.dataset.index = i;
+            row.style.transform = `translateY(${i * rowHeight}px)`;
+            row.classList.toggle('active', i === activeIndex);
+            fillRow(row, i);
+            row.hidden = false;
+            rendered.set(i, row);
+        }
+    }
+
+    function schedule() {
+        if (!pending) pending = requestAnimationFrame(render);
+    }
+    function scrollTo(top) {
+        scrollTop = Math.max(0, top);
+        container.scrollTop = scrollTop;
+        schedule();
+    }
+    container.addEventListener('scroll', () => {
+        scrollTop = container.scrollTop;
+        schedule();
+    }, { passive: true });
+    if (window.ResizeObserver) {
+        new ResizeObserver(() => {
+            viewHeight = container.clientHeight;
+            schedule();
+        }).observe(container);
+    } else {
+        window.addEventListener('resize', () => {
+            viewHeight = container.clientHeight;
+            schedule();
+        });
+    }
+    render();
+
+    return {
+        setActive(index) {
+            if (index === activeIndex) return;
+            rendered.get(activeIndex)?.classList.remove('active');
+            activeIndex = index;
+            rendered.get(index)?.classList.add('active');
+        },
+        scrollToIndex(index) {
+            if (index < 0 || index >= count) return;
+            const top = paddingTop + index * rowHeight;
+            const bottom = top + rowHeight;
+            // Jump instantly: a smooth scroll restarted on every step
+            // keeps the compositor animating for the whole playback
+            if (top < scrollTop) {
+                scrollTo(top);
+            } else if (bottom > scrollTop + viewHeight) {
+                scrollTo(bottom - viewHeight);
+            }
+        },
+    };
+}
+
+function createEventRow() {
+    const item = document.createElement('div');
+    item.className = 'event-item';
+    item.innerHTML = '<span class="event-time"></span><span class="event-type"></span>';
+    return item;
+}
+
+function fillEventRow(item, i) {
+    const meta = eventMeta[i];
+    item.firstChild.textContent = meta.timeStr;
+    item.lastChild.textContent = events[i].type;
+    item.lastChild.className = 'event-type ' + meta.typeClass;
+}
+
+function createTranscriptRow() {
+    const span = document.createElement('span');
+    span.className = 'transcript-segment';
+    span.innerHTML = '<span class="transcript-time"></span>';
+    span.appendChild(document.createTextNode(''));
+    return span;
+}
+
+function fillTranscriptRow(span, i) {
+    const segment = transcriptData.segments[i];
+    span.dataset.start = segment.start;
+    span.dataset.end = segment.end;
+    span.firstChild.textContent = formatTime(segment.start);
+    span.lastChild.textContent = segment.text + ' ';
+}
+
+let eventRows = null;
+let transcriptRows = null;
+
+// Initialize
+function init() {
+    // Render event markers on timeline in a single DOM write
+    timelineMarkers.innerHTML = events.map(event =>
+        `<div class="timeline-marker" style="left: ${event.time / duration * 100}%"></div>`
+    ).join('');
+
+    // Render events list
+    eventRows = createVirtualList(eventsList, events.length, 40, createEventRow, fillEventRow);
+    eventsList.addEventListener('click', (e) => {
+        const item = e.target.closest('.event-item');
+        if (item) goToIndex(Number(item.dataset.index));
+    });
+
+    // Render transcript segments if available
+    if (transcriptContent && transcriptData.segments && transcriptData.segments.length > 0) {
+        transcriptContent.classList.add('virtual');
+        transcriptRows = createVirtualList(
+            transcriptContent, transcriptData.segments.length, 28,
+            createTranscriptRow, fillTranscriptRow,
+        );
+        transcriptContent.addEventListener('click', (e) => {
+            const span = e.target.closest('.transcript-segment');
+            if (span) seekToTranscript(parseFloat(span.dataset.start));
+        });
+    } else if (transcriptContent && transcriptData.text) {
+        // Fallback: show plain text if no segments
+        transcriptContent.textContent = transcriptData.text;
+    }
+
+    // Show first frame
+    updateDisplay();
+
+    // Audio setup
+    if (hasAudio && audio) {
+        const volumeSlider = document.getElementById('volume');
+        const muteCheckbox = document.getElementById('mute');
+
+        if (volumeSlider) {
+            volumeSlider.addEventListener('input', () => {
+                audio.volume = volumeSlider.value;
+            });
+            audio.volume = volumeSlider.value;
+        }
+
+        if (muteCheckbox) {
+            muteCheckbox.addEventListener('change', () => {
+                audio.muted = muteCheckbox.checked;
+            });
+        }
+    }
+
+    // Build the Copy All text while the page is idle so the click only
+    // has to hand it to the clipboard
+    requestIdle(getAllCopyText);
+}
+
+function getTypeClass(type) {
+    if (type.includes('click')) return 'click';
+    if (type.includes('drag')) return 'drag';
+    if (type.includes('scroll')) return 'scroll';
+    if (type.includes('type')) return 'type';
+    return '';
+}
+
+function formatTime(seconds) {
+    const mins = Math.floor(seconds / 60);
+    const secs = (seconds % 60).toFixed(2).padStart(5, '0');
+    return `${mins}:${secs}`;
+}
+
+// Event and frame times are sorted, so lookups by time are binary searches
+function lastIndexAtOrBefore(items, time, key = 'time') {
+    if (items.length === 0 || items[0][key] > time) return -1;
+    let lo = 0;
+    let hi = items.length - 1;
+    while (lo < hi) {
+        const mid = (lo + hi + 1) >> 1;
+        if (items[mid][key] <= time) {
+            lo = mid;
+        } else {
+            hi = mid - 1;
+        }
+    }
+    return lo;
+}
+
+function closestIndex(items, time) {
+    let i = lastIndexAtOrBefore(items, time);
+    if (i < 0) return 0;
+    if (i + 1 < items.length && items[i + 1].time - time < time - items[i].time) return i + 1;
+    // Prefer the earliest of several items at the same time
+    while (i > 0 && items[i - 1].time === items[i].time) i--;
+    return i;
+}
+
+// Frame rendering. createFrameRenderer decodes frames to ImageBitmaps,
+// keeps the decoded frames in a small LRU (a Map in use order) and paints
+// each frame with its event overlay into the canvas. It only uses its
+// arguments, so where OffscreenCanvas is available its source is run in a
+// worker that owns the canvas, taking decoding and drawing off the main
+// thread. Otherwise it runs here.
+const FRAME_CACHE_SIZE = 20;
+const PREFETCH_BEHIND = 2;
+const PREFETCH_AHEAD = 5;
+
+function createFrameRenderer(canvas, config) {
+    const ctx = canvas.getContext('2d');
+    const bitmaps = new Map();
+    let shownBitmap = null;
+    let shownIndex = -1;
+    let videoBitmap = null;
+    // What the page wants on screen
+    const view = { index: -1, event: null, showOverlay: true, displayWidth: 0, displayHeight: 0 };
+
+    function decode(index, image) {
+        let entry = bitmaps.get(index);
+        if (entry) {
+            bitmaps.delete(index);
+        } else {
+            entry = { bitmap: null, ready: null };
+            entry.ready = load(image)
+                .then(source => createImageBitmap(source))
+                .catch(() => null)
+                .then(bitmap => (entry.bitmap = bitmap));
+        }
+        bitmaps.set(index, entry);
+        evict();
+        return entry;
+    }
+
+    function load(image) {
+        if (config.frameFiles) {
+            // Sibling image files go through <img>, which unlike fetch can
+            // read them when the viewer is opened from file://
+            const img = new Image();
+            img.src = image;
+            return img.decode().then(() => img);
+        }
+        return fetch('data:' + config.frameMime + ';base64,' + image)
+            .then(response => response.blob());
+    }
+
+    function evict() {
+        for (const [index, entry] of bitmaps) {
+            if (bitmaps.size <= config.cacheSize) break;
+            if (index === view.index || index === shownIndex) continue;
+            bitmaps.delete(index);
+            // Release the decoded pixels now rather than at garbage collection
+            entry.ready.then(bitmap => bitmap && bitmap.close());
+        }
+    }
+
+    function setShown(bitmap, index) {
+        shownBitmap = bitmap;
+        shownIndex = index;
+        paint();
+    }
+
+    function paint() {
+        const event = view.event;
+        if (!event) return;
+
+        // The canvas has the frame's resolution; CSS (max-width/max-height)
+        // keeps its aspect ratio, so its displayed box is the displayed frame
+        // This handles Retina displays where image pixels != screen coordinates
+        const imgNaturalWidth = shownBitmap ? shownBitmap.width : config.screenWidth;
+        const imgNaturalHeight = shownBitmap ? shownBitmap.height : config.screenHeight;
+        if (canvas.width !== imgNaturalWidth || canvas.height !== imgNaturalHeight) {
+            canvas.width = imgNaturalWidth;
+            canvas.height = imgNaturalHeight;
+        }
+        const { displayWidth, displayHeight } = view;
+
+        // Paint the frame
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        if (shownBitmap) ctx.drawImage(shownBitmap, 0, 0);
+
+        if (!view.showOverlay || !(displayWidth > 0)) return;
+
+        // Overlay primitives are sized in CSS pixels, whatever the frame resolution
+        const canvasScale = imgNaturalWidth / displayWidth;
+        ctx.setTransform(canvasScale, 0, 0, canvasScale, 0, 0);
+
+        // Scale factors: convert mouse coordinates to display pixels
+        // Native observer mouse coords are LOGICAL (e.g., 1512x982 on Retina)
+        // screenWidth/Height we stored are in PHYSICAL space (e.g., 3024x1964)
+        // pixelRatio = physical/logical (e.g., 2.0 for Retina)
+        //
+        // To map mouse coord to display:
+        // 1. mouseCoord * pixelRatio = physical image coord
+        // 2. physical image coord * (displayWidth / imgNaturalWidth) = display coord
+        const scaleX = (displayWidth / imgNaturalWidth) * config.pixelRatio;
+        const scaleY = (displayHeight / imgNaturalHeight) * config.pixelRatio;
+
+        // Draw based on event type
+        const type = event.type;
+
+        if (type.includes('click') || type === 'mouse.down' || type === 'mouse.up') {
+            const x = event.x * scaleX;
+            const y = event.y * scaleY;
+            const radius = 20;
+
+            // Outer glow
+            ctx.beginPath();
+            ctx.arc(x, y, radius + 10, 0, Math.PI * 2);
+            ctx.fillStyle = 'rgba(255, 100, 100, 0.3)';
+            ctx.fill();
+
+            // The rest is one color; set it once. The pieces don't overlap,
+            // so their order doesn't matter.
+            ctx.strokeStyle = '#ff5f5f';
+            ctx.fillStyle = '#ff5f5f';
+
+            // Main circle
+            ctx.beginPath();
+            ctx.arc(x, y, radius, 0, Math.PI * 2);
+            ctx.lineWidth = 3;
+            ctx.stroke();
+
+            // Crosshair
+            ctx.beginPath();
+            ctx.moveTo(x - radius - 5, y);
+            ctx.lineTo(x - radius + 10, y);
+            ctx.moveTo(x + radius - 10, y);
+            ctx.lineTo(x + radius + 5, y);
+            ctx.moveTo(x, y - radius - 5);
+            ctx.lineTo(x, y - radius + 10);
+            ctx.moveTo(x, y + radius - 10);
+            ctx.lineTo(x, y + radius + 5);
+            ctx.lineWidth = 2;
+            ctx.stroke();
+
+            // Center dot
+            ctx.beginPath();
+            ctx.arc(x, y, 4, 0, Math.PI * 2);
+            ctx.fill();
+
+        } else if (type.includes('drag')) {
+            const startX = event.x * scaleX;
+            const startY = event.y * scaleY;
+            // End position = start + delta
+            const endX = (event.x + (event.dx || 0)) * scaleX;
+            const endY = (event.y + (event.dy || 0)) * scaleY;
+
+            ctx.strokeStyle = '#00d4aa';
+            ctx.fillStyle = '#00d4aa';
+
+            // Draw arrow from start to end
+            ctx.beginPath();
+            ctx.moveTo(startX, startY);
+            ctx.lineTo(endX, endY);
+            ctx.lineWidth = 3;
+            ctx.stroke();
+
+            // Start circle and end arrowhead in one fill (both wind clockwise,
+            // so they union where a short drag makes them overlap)
+            const angle = Math.atan2(endY - startY, endX - startX);
+            ctx.beginPath();
+            ctx.arc(startX, startY, 8, 0, Math.PI * 2);
+            ctx.moveTo(endX, endY);
+            ctx.lineTo(endX - 15 * Math.cos(angle - 0.4), endY - 15 * Math.sin(angle - 0.4));
+            ctx.lineTo(endX - 15 * Math.cos(angle + 0.4), endY - 15 * Math.sin(angle + 0.4));
+            ctx.closePath();
+            ctx.fill();
+
+        } else if (type.includes('scroll')) {
+            const x = event.x * scaleX;
+            const y = event.y * scaleY;
+
+            // Scroll indicator
+            ctx.beginPath();
+            ctx.arc(x, y, 15, 0, Math.PI * 2);
+            ctx.strokeStyle = '#a78bfa';
+            ctx.lineWidth = 2;
+            ctx.stroke();
+
+            // Arrows indicating scroll direction
+            const dy = event.dy || 0;
+            if (dy !== 0) {
+                const arrowY = dy > 0 ? -25 : 25;
+                ctx.beginPath();
+                ctx.moveTo(x, y + arrowY);
+                ctx.lineTo(x - 8, y + arrowY + (dy > 0 ? 10 : -10));
+                ctx.lineTo(x + 8, y + arrowY + (dy > 0 ? 10 : -10));
+                ctx.closePath();
+                ctx.fillStyle = '#a78bfa';
+                ctx.fill();
+            }
+
+        } else if (type.includes('type')) {
+            // Text bubble for keyboard input
+            const text = event.text || event.keys || '';
+            if (text) {
+                const bubbleX = 20;
+                const bubbleY = displayHeight - 60;
+                const padding = 10;
+
+                ctx.font = '16px monospace';
+                const metrics = ctx.measureText(text);
+                const textWidth = Math.min(metrics.width, 300);
+
+                // Background
+                ctx.fillStyle = 'rgba(52, 211, 153, 0.9)';
+                ctx.beginPath();
+                ctx.roundRect(bubbleX, bubbleY, textWidth + padding * 2, 36, 8);
+                ctx.fill();
+
+                // Text
+                ctx.fillStyle = '#fff';
+                ctx.fillText(text.substring(0, 30), bubbleX + padding, bubbleY + 24);
+            }
+        }
+
+        // Draw label
+        let label = event.type.split('.').pop();
+        if (event.text) label += ': ' + event.text.substring(0, 20);
+        else if (event.keys) label += ': ' + event.keys;
+
+        ctx.font = 'bold 14px sans-serif';
+        const labelMetrics = ctx.measureText(label);
+        const labelX = 10;
+        const labelY = 30;
+
+        // Label background
+        ctx.fillStyle = 'rgba(0, 0, 0, 0.7)';
+        ctx.beginPath();
+        ctx.roundRect(labelX - 5, labelY - 18, labelMetrics.width + 10, 24, 4);
+        ctx.fill();
+
+        // Label text
+        ctx.fillStyle = '#fff';
+        ctx.fillText(label, labelX, labelY);
+    }
+
+    return {
+        // Show frame `index` under `event`'s overlay. Without an image the
+        // last frame stays up (e.g. until a seeked video frame arrives).
+        show(index, image, event) {
+            view.index = index;
+            view.event = event;
+            if (!image) {
+                paint();
+                return;
+            }
+            const entry = decode(index, image);
+            if (entry.bitmap) {
+                setShown(entry.bitmap, index);
+            } else {
+                entry.ready.then(bitmap => {
+                    if (bitmap && view.index === index) setShown(bitmap, index);
+                });
+            }
+        },
+        // Decode frames ahead of time; items are [index, image] pairs
+        prefetch(items) {
+            for (const [index, image] of items) decode(index, image);
+        },
+        // Show a frame grabbed from the video
+        showBitmap(bitmap) {
+            const previous = videoBitmap;
+            videoBitmap = bitmap;
+            setShown(bitmap, -1);
+            if (previous) previous.close();
+        },
+        // Repaint after a change to showOverlay or the displayed size
+        redraw(changes) {
+            Object.assign(view, changes);
+            paint();
+        },
+    };
+}
+
+// Worker entry point: forwards messages to a renderer on the transferred canvas
+function serveFrameRenderer(scope) {
+    let renderer = null;
+    scope.onmessage = ({ data }) => {
+        if (data.method === 'init') {
+            renderer = createFrameRenderer(...data.args);
+        } else {
+            renderer[data.method](...data.args);
+        }
+    };
+}
+
+function startFrameRenderer() {
+    const config = {
+        frameMime, frameFiles, screenWidth, screenHeight, pixelRatio, cacheSize: FRAME_CACHE_SIZE,
+    };
+    // Give the canvas the recording's shape before the first frame arrives
+    frameCanvas.width = screenWidth;
+    frameCanvas.height = screenHeight;
+
+    // Workers have no <img> to load frame files with
+    if (!frameFiles && 'transferControlToOffscreen' in frameCanvas && window.Worker) {
+        try {
+            const source = `${createFrameRenderer}\n(${serveFrameRenderer})(self);`;
+            const worker = new Worker(URL.createObjectURL(
+                new Blob([source], { type: 'text/javascript' })
+            ));
+            const offscreen = frameCanvas.transferControlToOffscreen();
+            worker.postMessage({ method: 'init', args: [offscreen, config] }, [offscreen]);
+            const send = method => (...args) => worker.postMessage({ method, args });
+            return {
+                show: send('show'),
+                prefetch: send('prefetch'),
+                redraw: send('redraw'),
+                showBitmap: bitmap => worker.postMessage({ method: 'showBitmap', args: [bitmap] }, [bitmap]),
+            };
+        } catch (e) {
+            // Workers can be unavailable (e.g. blocked by a CSP); draw here
+        }
+    }
+    return createFrameRenderer(frameCanvas, config);
+}
+
+const frameRenderer = startFrameRenderer();
+
+// The displayed canvas size changes with the window and the frame
+// resolution; ResizeObserver reports it without forcing a layout
+function resizeFrame(width, height) {
+    frameRenderer.redraw({ displayWidth: width, displayHeight: height });
+}
+if (window.ResizeObserver) {
+    new ResizeObserver(([entry]) => {
+        resizeFrame(entry.contentRect.width, entry.contentRect.height);
+    }).observe(frameCanvas);
+} else {
+    const measureFrame = () => {
+        const rect = frameCanvas.getBoundingClientRect();
+        resizeFrame(rect.width, rect.height);
+    };
+    window.addEventListener('resize', measureFrame);
+    measureFrame();
+}
+
+function drawOverlay(event) {
+    frameRenderer.redraw({ event, showOverlay });
+}
+
+const requestIdle = window.requestIdleCallback || (callback => setTimeout(callback, 1));
+const cancelIdle = window.cancelIdleCallback || clearTimeout;
+let prefetchHandle = 0;
+
+function prefetchFrames(index) {
+    cancelIdle(prefetchHandle);
+    prefetchHandle = requestIdle(() => {
+        // Ahead first, since that is where playback goes
+        const items = [];
+        for (let k = 1; k <= PREFETCH_AHEAD + PREFETCH_BEHIND; k++) {
+            const i = k <= PREFETCH_AHEAD ? index + k : index + PREFETCH_AHEAD - k;
+            if (i >= 0 && i < frames.length && frames[i].image) items.push([i, frames[i].image]);
+        }
+        frameRenderer.prefetch(items);
+    }, { timeout: 200 });
+}
+
+// Video seek mode: paint the frame at a step's time from the video
+let videoSeekTimer = null;
+
+function paintVideoFrame() {
+    createImageBitmap(frameVideo).then(bitmap => frameRenderer.showBitmap(bitmap), () => {});
+}
+
+function showVideoFrame(time) {
+    // Debounce so scrubbing only seeks to where the user stops
+    clearTimeout(videoSeekTimer);
+    videoSeekTimer = setTimeout(() => {
+        if ('requestVideoFrameCallback' in frameVideo) {
+            frameVideo.requestVideoFrameCallback(paintVideoFrame);
+        } else {
+            frameVideo.addEventListener('seeked', paintVideoFrame, { once: true });
+        }
+        frameVideo.currentTime = Math.max(0, time + videoOffset);
+    }, 80);
+}
+
+// Index whose frame time, details and step counter are on screen
+let shownIndex = -1;
+
+function updateDisplay(skipAudioSync = false) {
+    const frame = frames[currentIndex];
+    const event = events[currentIndex];
+    // Re-showing the same step (e.g. a seek within it) only needs the
+    // frame, clock and audio refreshed
+    const changed = currentIndex !== shownIndex;
+    shownIndex = currentIndex;
+
+    // Update frame
+    const image = frame ? frame.image : '';
+    frameRenderer.show(currentIndex, image, event);
+    if (image) {
+        prefetchFrames(currentIndex);
+    } else if (frame && videoSrc) {
+        showVideoFrame(frame.time);
+    }
+
+    // Update time displays
+    if (changed) {
+        frameTime.textContent = eventMeta[currentIndex].timeStr;
+    }
+
+    // Update clock and timeline (only if not playing - playback updates these directly)
+    if (!isPlaying) {
+        showPlaybackTime(event.time);
+    }
+
+    // Update events list
+    eventRows.setActive(currentIndex);
+    eventRows.scrollToIndex(currentIndex);
+
+    // Update details and step counter
+    if (changed) {
+        updateDetails(event);
+        updateStepCounter();
+    }
+
+    // Sync audio only on manual navigation, not during playback
+    if (hasAudio && audio && !skipAudioSync && !isPlaying) {
+        audio.currentTime = event.time;
+    }
+}
+
+function updateStepCounter() {
+    stepCounter.textContent = `Step ${currentIndex + 1} / ${frames.length}`;
+    stepPrev.disabled = currentIndex === 0;
+    stepNext.disabled = currentIndex === frames.length - 1;
+}
+
+function updateDetails(event) {
+    currentEvent = event;
+    const meta = eventMeta[event.index];
+    if (meta.detailsHTML === null) {
+        let html = '';
+        for (const [key, value] of Object.entries(event)) {
+            if (key === 'index') continue;
+            const displayValue = key === 'time' ? meta.timeStr : value;
+            html += `<div class="detail-row">
+            <span class="detail-key">${key}:</span>
+            <span class="detail-value">${displayValue ?? '-'}</span>
+        </div>`;
+        }
+        meta.detailsHTML = html;
+    }
+    detailsContent.innerHTML = meta.detailsHTML;
+}
+
+function formatEventForCopy(event) {
+    const meta = eventMeta[event.index];
+    if (meta.copyText === null) {
+        const lines = [];
+        for (const [key, value] of Object.entries(event)) {
+            if (key === 'index') continue;
+            const displayValue = key === 'time' ? meta.timeStr : value;
+            lines.push(`${key}: ${displayValue ?? '-'}`);
+        }
+        meta.copyText = lines.join('\n');
+    }
+    return meta.copyText;
+}
+
+function copyEventDetails() {
+    if (!currentEvent) return;
+
+    const text = formatEventForCopy(currentEvent);
+
+    navigator.clipboard.writeText(text).then(() => {
+        btnCopy.textContent = 'Copied!';
+        btnCopy.classList.add('copied');
+        setTimeout(() => {
+            btnCopy.textContent = 'Copy';
+            btnCopy.classList.remove('copied');
+        }, 1500);
+    });
+}
+
+// Events never change, so the Copy All text is built once
+let allCopyText = null;
+
+function getAllCopyText() {
+    if (allCopyText === null) {
+        allCopyText = events.map((event, i) => {
+            return `--- Event ${i + 1} ---\n${formatEventForCopy(event)}`;
+        }).join('\n\n');
+    }
+    return allCopyText;
+}
+
+function copyAllEvents() {
+    navigator.clipboard.writeText(getAllCopyText()).then(() => {
+        btnCopyAll.textContent = 'Copied!';
+        btnCopyAll.classList.add('copied');
+        setTimeout(() => {
+            btnCopyAll.textContent = 'Copy All';
+            btnCopyAll.classList.remove('copied');
+        }, 1500);
+    });
+}
+
+function goToIndex(index) {
+    currentIndex = Math.max(0, Math.min(frames.length - 1, index));
+    // If playing, pause first so we can seek properly
+    if (isPlaying) {
+        togglePlay();
+    }
+    updateDisplay();
+    // Force audio sync for navigation
+    if (hasAudio && audio) {
+        const targetTime = events[currentIndex].time;
+        audio.currentTime = targetTime;
+        updateActiveTranscript(targetTime);
+    }
+}
+
+function seekToTranscript(time) {
+    // Seek audio to transcript segment time
+    if (hasAudio && audio) {
+        audio.currentTime = time;
+        // Find the closest event to this time
+        currentIndex = closestIndex(events, time);
+        updateDisplay(true);  // skip audio sync since we just set it
+        updateActiveTranscript(time);
+    }
+}
+
+// Last transcript segment starting at or before the last time shown
+let transcriptIndex = -1;
+let transcriptTime = -Infinity;
+
+function updateActiveTranscript(currentTime) {
+    if (!transcriptRows) return;
+    const segments = transcriptData.segments;
+    if (currentTime < transcriptTime || currentTime - transcriptTime > 1) {
+        // Seek: search again
+        transcriptIndex = lastIndexAtOrBefore(segments, currentTime, 'start');
+    } else {
+        // Playback only moves forward a little between ticks
+        while (transcriptIndex + 1 < segments.length && segments[transcriptIndex + 1].start <= currentTime) {
+            transcriptIndex++;
+        }
+    }
+    transcriptTime = currentTime;
+    const segment = segments[transcriptIndex];
+    const active = segment && currentTime < segment.end ? transcriptIndex : -1;
+    transcriptRows.setActive(active);
+    transcriptRows.scrollToIndex(active);
+}
+
+function next() {
+    if (currentIndex < frames.length - 1) {
+        currentIndex++;
+        updateDisplay();
+    } else if (isPlaying) {
+        togglePlay();
+    }
+}
+
+function prev() {
+    if (currentIndex > 0) {
+        currentIndex--;
+        updateDisplay();
+    }
+}
+
+function togglePlay() {
+    isPlaying = !isPlaying;
+    btnPlay.textContent = isPlaying ? '⏸' : '▶';
+
+    if (isPlaying) {
+        // Start audio from current event time
+        if (hasAudio && audio) {
+            audio.currentTime = events[currentIndex].time;
+            audio.play();
+        }
+        // Use audio timeupdate to drive event updates, or fallback timer
+        if (hasAudio && audio) {
+            audio.ontimeupdate = () => {
+                if (!isPlaying) return;
+                const currentTime = audio.currentTime;
+                // Find the event that matches current audio time
+                const found = lastIndexAtOrBefore(events, currentTime);
+                const newIndex = found < 0 ? currentIndex : found;
+                if (newIndex !== currentIndex) {
+                    currentIndex = newIndex;
+                    updateDisplay(true);  // skip audio sync
+                }
+                showPlaybackTime(currentTime);
+                // Update active transcript segment
+                updateActiveTranscript(currentTime);
+            };
+            audio.onended = () => {
+                isPlaying = false;
+                btnPlay.textContent = '▶';
+            };
+        } else {
+            // No audio: play at real speed, one update per display frame
+            // (paused along with rendering while the tab is hidden)
+            const startTime = events[currentIndex].time;
+            const startRealTime = performance.now();
+            const tick = () => {
+                if (!isPlaying) return;
+                const elapsed = (performance.now() - startRealTime) / 1000;
+                const currentTime = startTime + elapsed;
+                // Find matching event
+                const newIndex = Math.max(currentIndex, lastIndexAtOrBefore(events, currentTime));
+                if (newIndex !== currentIndex) {
+                    currentIndex = newIndex;
+                    updateDisplay();
+                }
+                showPlaybackTime(currentTime);
+                // Stop at end
+                if (currentTime >= duration) {
+                    togglePlay();
+                    return;
+                }
+                playFrame = requestAnimationFrame(tick);
+            };
+            playFrame = requestAnimationFrame(tick);
+        }
+    } else {
+        if (hasAudio && audio) {
+            audio.pause();
+            audio.ontimeupdate = null;
+            audio.onended = null;
+        }
+        cancelAnimationFrame(playFrame);
+    }
+}
+
+// Playback writes the clock and progress bar on every tick; skip the DOM
+// writes when the displayed values haven't changed
+let shownPlaybackTime = '';
+let shownProgress = '';
+
+function showPlaybackTime(time) {
+    const progress = (time / duration) * 100 + '%';
+    if (progress !== shownProgress) {
+        timelineProgress.style.width = progress;
+        shownProgress = progress;
+    }
+    const timeStr = formatTime(time);
+    if (timeStr !== shownPlaybackTime) {
+        currentTimeEl.textContent = timeStr;
+        shownPlaybackTime = timeStr;
+    }
+}
+
+function toggleOverlay() {
+    showOverlay = !showOverlay;
+    btnOverlay.checked = showOverlay;
+    drawOverlay(events[currentIndex]);
+}
+
+// Event listeners
+document.getElementById('btn-play').addEventListener('click', togglePlay);
+document.getElementById('btn-next').addEventListener('click', next);
+document.getElementById('btn-prev').addEventListener('click', prev);
+document.getElementById('btn-first').addEventListener('click', () => goToIndex(0));
+document.getElementById('btn-last').addEventListener('click', () => goToIndex(frames.length - 1));
+stepPrev.addEventListener('click', prev);
+stepNext.addEventListener('click', next);
+btnCopy.addEventListener('click', copyEventDetails);
+btnCopyAll.addEventListener('click', copyAllEvents);
+btnOverlay.addEventListener('change', () => {
+    showOverlay = btnOverlay.checked;
+    drawOverlay(events[currentIndex]);
+});
+
+document.getElementById('timeline').addEventListener('click', (e) => {
+    const rect = e.target.getBoundingClientRect();
+    const x = e.clientX - rect.left;
+    const percent = x / rect.width;
+    const targetTime = percent * duration;
+
+    // Find closest frame
+    goToIndex(closestIndex(frames, targetTime));
+});
+
+// Keyboard shortcuts
+document.addEventListener('keydown', (e) => {
+    if (e.target.tagName === 'INPUT') return;
+
+    switch (e.code) {
+        case 'Space':
+            e.preventDefault();
+            togglePlay();
+            break;
+        case 'ArrowRight':
+            e.preventDefault();
+            next();
+            break;
+        case 'ArrowLeft':
+            e.preventDefault();
+            prev();
+            break;
+        case 'Home':
+            e.preventDefault();
+            goToIndex(0);
+            break;
+        case 'End':
+            e.preventDefault();
+            goToIndex(frames.length - 1);
+            break;
+        case 'KeyO':
+            e.preventDefault();
+            toggleOverlay();
+            break;
+    }
+});
+
+// Initialize
+init();
@@ -1,21 +1,61 @@
 """Generate interactive HTML viewer for capture recordings.
 
-Creates a self-contained HTML file with timeline navigation,
-frame viewing, event list, and audio playback.
+Creates an HTML file with timeline navigation, frame viewing, event list,
+and audio playback. Frames are embedded by default; included audio, the
+capture video (video_seek mode), frame images (frame_files mode) and the
+viewer's stylesheet and script (split_assets) are written as sidecar files
+next to the HTML instead, named after it where they are per-capture.
 """
 
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
+import shutil
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from html import escape as html_escape
+from importlib import resources
 from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+from urllib.parse import quote
 
 if TYPE_CHECKING:
+    import numpy as np
     from PIL import Image
 
-    from openadapt_capture.capture import CaptureSession
+    from openadapt_capture.capture import Action, CaptureSession
+
+# Frames submitted to the encode process pool but not yet collected, per
+# worker; bounds how many raw pixel buffers are copied out at once
+_ENCODE_IN_FLIGHT_PER_WORKER = 2
+# Frames decoded and encoded together; bounds how many full-resolution
+# screenshots are held in memory at once
+_ENCODE_BATCH_SIZE = 32
+# Frames at or below this many pixels use the default PIL -> NumPy conversion
+_RAW_ENCODE_MIN_PIXELS = 256 * 256
+# Write buffer for streaming the generated HTML to disk
+_HTML_WRITE_BUFFER = 1 << 20
+# Audio is base64-encoded in reads of this size; a multiple of 3 so each
+# chunk encodes without padding and the pieces concatenate cleanly
+_AUDIO_CHUNK_SIZE = 3 * 1024 * 1024
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+# Default quality per embedded frame format; chosen near the knee of the
+# size-vs-quality curve, where higher settings grow files much faster than
+# they improve screenshots
+_DEFAULT_FRAME_QUALITY = {"jpeg": 82, "webp": 80}
+_FRAME_MIME_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp"}
+# Encoded frames kept per capture across create_html calls
+_FRAME_CACHE_SIZE = 1024
+# Stylesheet and script of the viewer, bundled under visualize/assets
+_VIEWER_ASSETS = ("viewer.css", "viewer.js")
+# Short names for event fields in the embedded JSON; the viewer's
+# expandEvents() maps them back
+_EVENT_KEYS = {"time": "t", "type": "e", "text": "tx", "keys": "k", "button": "b"}
 
 
 def create_html(
@@ -24,7 +64,13 @@ def create_html(
     max_events: int | None = 200,
     include_audio: bool = False,
     frame_scale: float = 1.0,
-    frame_quality: int = 85,
+    frame_quality: int | None = None,
+    mode: str = "embedded",
+    frame_format: str = "jpeg",
+    embed_audio: bool = False,
+    use_cache: bool = True,
+    split_assets: bool = False,
+    workers: int | None = None,
 ) -> str:
     """Generate an interactive HTML viewer for a capture recording.
 
@@ -32,19 +78,70 @@ def create_html(
         capture_or_path: CaptureSession object or path to capture directory.
         output: Output path for HTML file. If None, returns HTML string.
         max_events: Maximum events to include (None for all).
-        include_audio: Embed the raw waveform in the generated HTML (default:
-            False). The viewer is a single self-contained file that is easy to
-            forward, and an embedded waveform carries the demonstrator's voice
-            -- biometric identifying data with no sanitized derivative. Opt in
-            only when the HTML will stay inside the capture's local boundary.
+        include_audio: Include the raw waveform in the viewer (default:
+            False). It is copied next to the HTML output as
+            ``<name>_audio.<ext>``, or embedded with embed_audio. Either way
+            it travels with the viewer when that is forwarded, and it carries
+            the demonstrator's voice -- biometric identifying data with no
+            sanitized derivative. Opt in only when the HTML will stay inside
+            the capture's local boundary. The viewer is a single
+            self-contained file only when nothing is written beside it: no
+            include_audio (or embed_audio with it), the default "embedded"
+            mode, and no split_assets.
         frame_scale: Scale factor for embedded frames.
-        frame_quality: JPEG quality for embedded frames (1-100).
+        frame_quality: Quality for embedded frames (1-100). Defaults to 82
+            for JPEG and 80 for WebP.
+        mode: "embedded" (default) embeds one JPEG per step. "frame_files"
+            writes the encoded frames as image files into a ``<name>_frames``
+            directory next to the HTML output and references them by URL, so
+            the page stays small and the browser loads and decodes frames on
+            demand; frames are embedded when returning a string. "video_seek"
+            embeds no frames: the capture's video is copied next to the HTML
+            output as ``<name>_<video file name>`` (or referenced in place
+            when returning a string) and the viewer seeks it to each step.
+            The browser must be able to decode the capture's video codec.
+        frame_format: "jpeg" (progressive, Huffman-optimized) or "webp" for
+            embedded frames. WebP falls back to JPEG when Pillow was built
+            without WebP support.
+        embed_audio: With include_audio, embed the audio as a base64 data URL
+            instead of copying it next to the HTML output as a sidecar file
+            the viewer references (default). The sidecar avoids base64 bloat
+            and lets the browser stream and range-seek the audio. Audio is
+            always embedded when the HTML is returned as a string.
+        use_cache: Reuse frames encoded by earlier calls on the same
+            CaptureSession with the same scale, quality and format, skipping
+            both video decode and encode. Disable for deterministic timing.
+        split_assets: Write the viewer's stylesheet and script as
+            ``viewer.css``/``viewer.js`` next to the HTML output and link them
+            instead of inlining them, so viewers in one directory share a
+            single browser-cached copy. Ignored when returning a string.
+        workers: Encode frames in this many worker processes (default:
+            None, encode in this process). Worker processes re-import the
+            calling script under the "spawn" start method (Windows, macOS),
+            so a script passing this needs an ``if __name__ == "__main__":``
+            guard.
 
     Returns:
         HTML string if output is None, otherwise None after writing file.
+
+    Raises:
+        ValueError: If mode or frame_format is unknown, or "video_seek" is
+            requested for a capture without video.
     """
+    import numpy as np
+    from PIL import features
+
     from openadapt_capture.capture import CaptureSession
 
+    if mode not in ("embedded", "frame_files", "video_seek"):
+        raise ValueError(f"Unsupported viewer mode: {mode}")
+    if frame_format not in _FRAME_MIME_TYPES:
+        raise ValueError(f"Unsupported frame format: {frame_format}")
+    if frame_format == "webp" and not features.check("webp"):
+        frame_format = "jpeg"
+    if frame_quality is None:
+        frame_quality = _DEFAULT_FRAME_QUALITY[frame_format]
+
     # Load capture if path provided
     if isinstance(capture_or_path, (str, Path)):
         capture = CaptureSession.load(capture_or_path)
@@ -59,31 +156,45 @@ def create_html(
     screen_width, screen_height = capture.screen_size
     pixel_ratio = getattr(capture, "pixel_ratio", 1.0)
     audio_start_time = getattr(capture, "audio_start_time", None)
+    video_seek = mode == "video_seek"
+    if video_seek and not capture.video_path:
+        raise ValueError(f"Capture has no video to seek: {capture_path}")
 
     # Get actions
     actions = list(capture.actions())
     if max_events is not None and len(actions) > max_events:
-        # Sample evenly
-        step = len(actions) / max_events
-        indices = [int(i * step) for i in range(max_events)]
-        actions = [actions[i] for i in indices]
+        # Sample evenly, always keeping the first and last action
+        indices = np.linspace(0, len(actions) - 1, max_events, dtype=np.int64)
+        actions = [actions[i] for i in indices.tolist()]
 
-    # Prepare frame data
+    # Prepare frame data; screenshots are fetched lazily while encoding, so
+    # only one encode batch of them is decoded at a time
     frames_data = []
+    frame_sources: list[Image.Image | Callable[[], Image.Image] | None] = []
+    frame_times = []
     events_data = []
+    cache = getattr(capture, "_jpeg_cache", None) if use_cache and not video_seek else None
+    cache_params = (frame_scale, frame_quality, frame_format)
+
+    def cached(timestamp: float) -> bool:
+        return cache is not None and (timestamp, *cache_params) in cache
+
     # Use audio_start_time as reference if available, otherwise first action
     start_time = audio_start_time if audio_start_time else (actions[0].timestamp if actions else 0)
 
     # Add a "start" marker at time 0 with the first frame from the video
     if actions and capture.video_path:
-        first_frame = capture.get_frame_at(start_time)
-        if first_frame:
-            frame_b64 = _image_to_base64(first_frame, scale=frame_scale, quality=frame_quality)
+        first_cached = cached(start_time)
+        first_frame = None
+        if not (video_seek or first_cached):
+            first_frame = capture.get_frame_at(start_time)
+        if first_frame or video_seek or first_cached:
             frames_data.append({
                 "index": 0,
                 "time": 0.0,
-                "image": frame_b64,
             })
+            frame_sources.append(first_frame)
+            frame_times.append(start_time)
             events_data.append({
                 "index": 0,
                 "time": 0.0,
@@ -93,59 +204,45 @@ def create_html(
     # Offset for indices if we added start marker
     idx_offset = len(frames_data)
 
-    for i, action in enumerate(actions):
+    # Gather timestamps once and offset them in one vectorized step
+    timestamps = np.fromiter(
+        (action.timestamp for action in actions), dtype=np.float64, count=len(actions)
+    )
+    rel_times = (timestamps - start_time).tolist()
+
+    for i, (action, timestamp, rel_time) in enumerate(
+        zip(actions, timestamps.tolist(), rel_times)
+    ):
         idx = i + idx_offset
-        rel_time = action.timestamp - start_time
         event_type = action.type if isinstance(action.type, str) else action.type.value
 
-        # Encode screenshot
-        screenshot = action.screenshot
-        if screenshot is not None:
-            frame_b64 = _image_to_base64(screenshot, scale=frame_scale, quality=frame_quality)
-        else:
-            frame_b64 = ""
-
         frames_data.append({
             "index": idx,
             "time": rel_time,
-            "image": frame_b64,
         })
+        skip = video_seek or cached(timestamp)
+        frame_sources.append(None if skip else partial(getattr, action, "screenshot"))
+        frame_times.append(timestamp)
 
-        # Event data
+        # Event data, with type-specific fields
         event_dict = {
             "index": idx,
             "time": rel_time,
             "type": event_type,
-            "x": getattr(action, "x", None),
-            "y": getattr(action, "y", None),
         }
-
-        # Add type-specific fields
-        if hasattr(action, "text"):
-            event_dict["text"] = action.text
-        if hasattr(action, "keys"):
-            keys = action.keys
-            if keys:
-                event_dict["keys"] = "+".join(keys)
-        if hasattr(action, "button"):
-            event_dict["button"] = str(action.button)
-        # dx/dy for drags and scrolls
-        if hasattr(action.event, "dx"):
-            event_dict["dx"] = action.event.dx
-            event_dict["dy"] = action.event.dy
-
+        event_dict.update(_FIELD_EXTRACTORS.get(event_type, _generic_fields)(action))
         events_data.append(event_dict)
 
     # Prepare audio data and get audio duration
-    audio_b64 = ""
+    audio_file = None
+    audio_src = ""
     audio_type = ""
     audio_duration = 0.0
     transcript = ""
     if include_audio:
         audio_path = capture_path / "audio.flac"
         if audio_path.exists():
-            with open(audio_path, "rb") as f:
-                audio_b64 = base64.b64encode(f.read()).decode("utf-8")
+            audio_file = audio_path
             audio_type = "audio/flac"
             # Get audio duration using soundfile
             try:
@@ -168,11 +265,14 @@ def create_html(
             for ext, mime in [(".mp3", "audio/mpeg"), (".wav", "audio/wav"), (".ogg", "audio/ogg")]:
                 alt_path = capture_path / f"audio{ext}"
                 if alt_path.exists():
-                    with open(alt_path, "rb") as f:
-                        audio_b64 = base64.b64encode(f.read()).decode("utf-8")
+                    audio_file = alt_path
                     audio_type = mime
                     break
 
+    if audio_file is not None and not embed_audio and output is not None:
+        audio_src = _sidecar_source(audio_file, output)
+        audio_file = None
+
     # Calculate effective duration as max of audio duration and last event time
     last_event_time = events_data[-1]["time"] if events_data else 0
     effective_duration = max(audio_duration, duration, last_event_time)
@@ -181,59 +281,357 @@ def create_html(
     if effective_duration > 0 and capture.video_path:
         # Get the last frame from the video
         end_timestamp = start_time + effective_duration
-        last_frame = capture.get_frame_at(end_timestamp)
-        if last_frame:
+        last_cached = cached(end_timestamp)
+        last_frame = None
+        if not (video_seek or last_cached):
+            last_frame = capture.get_frame_at(end_timestamp)
+        if last_frame or video_seek or last_cached:
             end_idx = len(frames_data)
-            frame_b64 = _image_to_base64(last_frame, scale=frame_scale, quality=frame_quality)
             frames_data.append({
                 "index": end_idx,
                 "time": effective_duration,
-                "image": frame_b64,
             })
+            frame_sources.append(last_frame)
+            frame_times.append(end_timestamp)
             events_data.append({
                 "index": end_idx,
                 "time": effective_duration,
                 "type": "recording.end",
             })
 
+    # Encode screenshots
+    encoded = _images_to_base64(
+        (source() if callable(source) else source for source in frame_sources),
+        scale=frame_scale,
+        quality=frame_quality,
+        fmt=frame_format,
+        workers=workers,
+    )
+    if cache is not None:
+        keys = [(timestamp, *cache_params) for timestamp in frame_times]
+        # Take hits before storing, so new entries cannot evict them first;
+        # re-inserting moves them to the end, leaving LRU entries at the front
+        for i, key in enumerate(keys):
+            if not encoded[i] and key in cache:
+                encoded[i] = cache[key] = cache.pop(key)
+        for key, frame_b64 in zip(keys, encoded):
+            if frame_b64:
+                cache[key] = frame_b64
+        while len(cache) > _FRAME_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    frame_files = mode == "frame_files" and output is not None
+    if frame_files:
+        encoded = _write_frame_files(encoded, output, frame_format)
+    for frame, frame_b64 in zip(frames_data, encoded):
+        frame["image"] = frame_b64
+
+    # Write shared viewer assets beside the output instead of inlining them
+    split_assets = split_assets and output is not None
+    if split_assets:
+        for name in _VIEWER_ASSETS:
+            _write_asset(name, Path(output).parent)
+
+    # Locate the video the viewer seeks instead of embedded frames
+    video_src = ""
+    video_offset = 0.0
+    if video_seek:
+        video_src = _sidecar_source(capture.video_path, output)
+        video_offset = start_time - capture.video_start_time
+
     # Generate HTML
-    html = _generate_html(
+    chunks = _iter_html_chunks(
         capture_id=capture_id,
         duration=effective_duration,
         frames_data=frames_data,
         events_data=events_data,
-        audio_b64=audio_b64,
+        audio_file=audio_file,
         audio_type=audio_type,
+        audio_src=audio_src,
         screen_width=screen_width,
         screen_height=screen_height,
         pixel_ratio=pixel_ratio,
         transcript=transcript,
+        video_src=video_src,
+        video_offset=video_offset,
+        frame_mime=_FRAME_MIME_TYPES[frame_format],
+        frame_files=frame_files,
+        split_assets=split_assets,
     )
 
     if output is not None:
+        # Stream sections straight to disk so the full document (frames and
+        # audio included) is never held in memory as one string
         output = Path(output)
-        output.write_text(html, encoding="utf-8")
+        with output.open("wb", buffering=_HTML_WRITE_BUFFER) as f:
+            f.writelines(chunks)
         return None
     else:
-        return html
+        return b"".join(chunks).decode("utf-8")
+
+
+def _mouse_fields(action: "Action") -> dict:
+    """Viewer fields for clicks, presses and moves."""
+    event = action.event
+    return {"x": event.x, "y": event.y, "button": getattr(event, "button", None)}
+
+
+def _drag_fields(action: "Action") -> dict:
+    """Viewer fields for drags."""
+    event = action.event
+    return {"x": event.x, "y": event.y, "button": event.button, "dx": event.dx, "dy": event.dy}
+
+
+def _scroll_fields(action: "Action") -> dict:
+    """Viewer fields for scrolls."""
+    event = action.event
+    return {"x": event.x, "y": event.y, "dx": event.dx, "dy": event.dy}
+
+
+def _key_type_fields(action: "Action") -> dict:
+    """Viewer fields for typed text."""
+    keys = action.keys
+    return {"text": action.event.text, "keys": "+".join(keys) if keys else None}
+
+
+def _key_shortcut_fields(action: "Action") -> dict:
+    """Viewer fields for key shortcuts."""
+    event = action.event
+    return {"keys": "+".join([*event.modifiers, event.key])}
+
+
+def _generic_fields(action: "Action") -> dict:
+    """Viewer fields for action types without a dedicated extractor."""
+    fields = {"x": getattr(action, "x", None), "y": getattr(action, "y", None)}
+    if hasattr(action, "text"):
+        fields["text"] = action.text
+    if getattr(action, "keys", None):
+        fields["keys"] = "+".join(action.keys)
+    if getattr(action, "button", None) is not None:
+        fields["button"] = str(action.button)
+    if hasattr(action.event, "dx"):
+        fields["dx"] = action.event.dx
+        fields["dy"] = action.event.dy
+    return fields
+
+
+# Event type -> extractor of the type's viewer fields; reads event attributes
+# directly instead of probing every action for every field
+_FIELD_EXTRACTORS = {
+    "mouse.move": _mouse_fields,
+    "mouse.down": _mouse_fields,
+    "mouse.up": _mouse_fields,
+    "mouse.click": _mouse_fields,
+    "mouse.singleclick": _mouse_fields,
+    "mouse.doubleclick": _mouse_fields,
+    "mouse.drag": _drag_fields,
+    "mouse.scroll": _scroll_fields,
+    "key.type": _key_type_fields,
+    "key.shortcut": _key_shortcut_fields,
+}
+
+
+def _sidecar_source(path: Path, output: str | Path | None) -> str:
+    """Place a capture media file next to the HTML output and return its URL.
+
+    The copy is named after the output (``viewer.html`` gets
+    ``viewer_audio.flac``), so viewers of different captures written to one
+    directory do not overwrite each other's media.
+
+    Args:
+        path: Capture media file (video or audio).
+        output: HTML output path, or None when the HTML is returned as a string.
+
+    Returns:
+        URL for the viewer's media element: a sibling file name when writing
+        to disk, otherwise a ``file://`` URI to the capture file.
+    """
+    if output is None:
+        return path.resolve().as_uri()
 
+    output = Path(output)
+    target = output.parent / f"{output.stem}_{path.name}"
+    if not target.exists() or not target.samefile(path):
+        shutil.copyfile(path, target)
+    return quote(target.name)
 
-def _image_to_base64(image: "Image.Image", scale: float = 1.0, quality: int = 85) -> str:
-    """Convert PIL Image to base64 JPEG string.
+
+def _write_frame_files(encoded: list[bytes], output: str | Path, fmt: str) -> list[bytes]:
+    """Write encoded frames as image files beside the HTML output.
+
+    Frames that share an encoding (unchanged screens) share one file.
+
+    Args:
+        encoded: Base64 frame encodings as returned by ``_images_to_base64``;
+            empty entries have no image.
+        output: HTML output path.
+        fmt: Frame format the encodings use ("jpeg" or "webp").
+
+    Returns:
+        Per frame, the image URL relative to the HTML output as ASCII bytes,
+        or ``b""`` where the frame has no image.
+    """
+    output = Path(output)
+    directory = output.parent / f"{output.stem}_frames"
+    directory.mkdir(exist_ok=True)
+    suffix = ".jpg" if fmt == "jpeg" else f".{fmt}"
+    # Keyed on the encoding itself, so equal frames share a file even when
+    # their bytes objects were built separately
+    urls: dict[bytes, bytes] = {}
+    result = []
+    for frame_b64 in encoded:
+        if not frame_b64:
+            result.append(b"")
+            continue
+        url = urls.get(frame_b64)
+        if url is None:
+            name = f"{len(urls):05d}{suffix}"
+            (directory / name).write_bytes(base64.b64decode(frame_b64))
+            url = urls[frame_b64] = quote(f"{directory.name}/{name}").encode()
+        result.append(url)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _load_asset(name: str) -> str:
+    """Read a bundled viewer asset.
+
+    Assets are constant for the life of the process, so each is read once.
+
+    Args:
+        name: File name under ``visualize/assets``.
+
+    Returns:
+        Asset text.
+    """
+    return resources.files(__package__).joinpath("assets", name).read_text(encoding="utf-8")
+
+
+def _write_asset(name: str, directory: Path) -> None:
+    """Copy a bundled viewer asset into a directory unless it is already current.
+
+    Args:
+        name: File name under ``visualize/assets``.
+        directory: Destination directory.
+    """
+    data = _load_asset(name).encode("utf-8")
+    target = directory / name
+    if not target.exists() or target.read_bytes() != data:
+        target.write_bytes(data)
+
+
+def _image_to_base64(
+    image: "Image.Image",
+    scale: float = 1.0,
+    quality: int = 82,
+    fmt: str = "jpeg",
+) -> bytes:
+    """Convert PIL Image to base64 JPEG (or WebP) bytes.
+
+    Args:
+        image: PIL Image.
+        scale: Scale factor.
+        quality: Encoder quality.
+        fmt: "jpeg" or "webp".
+
+    Returns:
+        Base64-encoded image as ASCII bytes.
+    """
+    image = _prepare_image(image, scale)
+    return base64.b64encode(_encode_frame(image, quality, fmt))
+
+
+def _images_to_base64(
+    images: "Iterable[Image.Image | None]",
+    scale: float = 1.0,
+    quality: int = 82,
+    fmt: str = "jpeg",
+    workers: int | None = None,
+) -> list[bytes]:
+    """Convert a sequence of PIL Images to base64 JPEG (or WebP) bytes.
+
+    Images are consumed lazily and encoded ``_ENCODE_BATCH_SIZE`` distinct
+    frames at a time, so a generator of screenshots is never fully decoded
+    into memory at once.
+
+    Identical frames (e.g. a burst of keystrokes with no visual change) are
+    detected by a 128-bit BLAKE2 digest of their pixels and encoded once;
+    every duplicate reuses the same bytes object. Only digests are kept
+    between frames, never the frames themselves.
+
+    Args:
+        images: PIL Images; None entries produce empty bytes.
+        scale: Scale factor.
+        quality: Encoder quality.
+        fmt: "jpeg" or "webp".
+        workers: Number of encode worker processes; None or 1 encodes in
+            this process.
+
+    Returns:
+        Base64-encoded images as ASCII bytes, in input order.
+    """
+    encoded: list[bytes] = []
+    pending: list["Image.Image"] = []
+    slots: list[int | None] = []
+    seen: dict[tuple, int] = {}
+
+    pool = (
+        ProcessPoolExecutor(max_workers=workers)
+        if workers is not None and workers > 1
+        else nullcontext()
+    )
+    with pool as executor:
+
+        def flush() -> None:
+            batch = _encode_frame_batch(
+                pending, quality, fmt, executor, _ENCODE_IN_FLIGHT_PER_WORKER * (workers or 1)
+            )
+            encoded.extend(base64.b64encode(data) for data in batch)
+            pending.clear()
+
+        for image in images:
+            if image is None:
+                slots.append(None)
+                continue
+            prepared = None
+            if scale < 1.0 and image.format == "JPEG":
+                # Prepare before hashing so the JPEG is decoded at reduced size
+                image = prepared = _prepare_image(image, scale)
+            digest = hashlib.blake2b(_image_to_array(image), digest_size=16).digest()
+            key = (image.mode, image.size, digest)
+            slot = seen.get(key)
+            if slot is None:
+                slot = seen[key] = len(seen)
+                pending.append(prepared if prepared is not None else _prepare_image(image, scale))
+                if len(pending) >= _ENCODE_BATCH_SIZE:
+                    flush()
+            slots.append(slot)
+        flush()
+
+    return [encoded[slot] if slot is not None else b"" for slot in slots]
+
+
+def _prepare_image(image: "Image.Image", scale: float = 1.0) -> "Image.Image":
+    """Scale a PIL Image and flatten it to RGB for JPEG encoding.
+
+    When downscaling a not-yet-decoded JPEG, libjpeg is asked (via ``draft``)
+    to decode at a reduced size using DCT scaling, so only a cheap bilinear
+    pass is left to reach the exact target size.
 
     Args:
         image: PIL Image.
         scale: Scale factor.
-        quality: JPEG quality.
 
     Returns:
-        Base64-encoded JPEG string.
+        RGB PIL Image.
     """
     from PIL import Image
 
     if scale != 1.0:
         new_size = (int(image.width * scale), int(image.height * scale))
-        image = image.resize(new_size, Image.Resampling.LANCZOS)
+        resample = Image.Resampling.LANCZOS
+        if scale < 1.0 and image.format == "JPEG" and image.draft("RGB", new_size):
+            resample = Image.Resampling.BILINEAR
+        image = image.resize(new_size, resample)
 
     # Convert to RGB if needed
     if image.mode in ("RGBA", "P"):
@@ -246,53 +644,248 @@ def _image_to_base64(image: "Image.Image", scale: float = 1.0, quality: int = 85
     elif image.mode != "RGB":
         image = image.convert("RGB")
 
+    return image
+
+
+def _encode_frame_batch(
+    images: "list[Image.Image]",
+    quality: int,
+    fmt: str = "jpeg",
+    executor: Executor | None = None,
+    max_in_flight: int = 1,
+) -> list[bytes | memoryview]:
+    """Encode a batch of RGB PIL Images as JPEG (or WebP) bytes.
+
+    When torchvision is installed, JPEG batches go through a single
+    ``torchvision.io.encode_jpeg`` call (on the GPU if CUDA is available),
+    which drives libjpeg-turbo from C without per-image Python overhead but
+    only emits baseline JPEG. Otherwise each image is encoded with
+    ``_encode_frame``, in ``executor``'s worker processes when one is given.
+
+    Args:
+        images: RGB PIL Images.
+        quality: Encoder quality.
+        fmt: "jpeg" or "webp".
+        executor: Process pool to encode in, or None to encode here.
+        max_in_flight: Most frames submitted to ``executor`` at once.
+
+    Returns:
+        Encoded images as bytes-like objects, in input order.
+    """
+    if not images:
+        return []
+    if fmt == "jpeg":
+        try:
+            import torch
+            from torchvision.io import encode_jpeg
+        except ImportError:
+            torch = None
+    if fmt != "jpeg" or torch is None:
+        if executor is None:
+            return [_encode_frame(image, quality, fmt) for image in images]
+        return _encode_frames_parallel(images, quality, fmt, executor, max_in_flight)
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    tensors = [
+        torch.tensor(_image_to_array(image)).permute(2, 0, 1).contiguous().to(device)
+        for image in images
+    ]
+    # View the encoded tensors' memory rather than copying it into bytes
+    return [
+        memoryview(t.cpu().numpy()).cast("B") for t in encode_jpeg(tensors, quality=quality)
+    ]
+
+
+def _encode_frames_parallel(
+    images: "list[Image.Image]",
+    quality: int,
+    fmt: str,
+    executor: Executor,
+    max_in_flight: int,
+) -> list[bytes]:
+    """Encode a batch of RGB PIL Images in a process pool.
+
+    Raw pixels are copied out for the workers as tasks are submitted, with a
+    bounded number in flight, rather than for the whole batch up front.
+
+    Args:
+        images: RGB PIL Images.
+        quality: Encoder quality.
+        fmt: "jpeg" or "webp".
+        executor: Process pool to encode in.
+        max_in_flight: Most frames submitted and not yet collected at once.
+
+    Returns:
+        Encoded images, in input order.
+    """
+    results = []
+    in_flight = deque()
+    for image in images:
+        # Ship raw pixels rather than PIL objects so the payload pickles cleanly
+        task = (image.mode, image.size, image.tobytes(), quality, fmt)
+        in_flight.append(executor.submit(_encode_one, task))
+        if len(in_flight) >= max_in_flight:
+            results.append(in_flight.popleft().result())
+    results.extend(future.result() for future in in_flight)
+    return results
+
+
+def _encode_one(task: tuple[str, tuple[int, int], bytes, int, str]) -> bytes:
+    """Process-pool entry point: rebuild a raw image and encode it."""
+    from PIL import Image
+
+    mode, size, data, quality, fmt = task
+    # Results are pickled back to the parent, which memoryviews cannot be
+    return bytes(_encode_frame(Image.frombytes(mode, size, data), quality, fmt))
+
+
+def _encode_frame(
+    image: "Image.Image", quality: int, fmt: str = "jpeg"
+) -> bytes | memoryview:
+    """Encode an RGB PIL Image as progressive JPEG or WebP bytes.
+
+    JPEGs are progressive with optimized Huffman tables and 4:2:0 chroma
+    subsampling, which is smaller than baseline at the same quality. Uses
+    OpenCV's libjpeg-turbo/libwebp build when ``cv2`` is installed, which is
+    noticeably faster than Pillow's encoder on large frames; falls back to
+    Pillow otherwise.
+
+    OpenCV output is returned as a view of its buffer rather than copied into
+    ``bytes``; Pillow's ``BytesIO.getvalue()`` already hands over its buffer
+    without a copy.
+
+    Args:
+        image: RGB PIL Image.
+        quality: Encoder quality.
+        fmt: "jpeg" or "webp".
+
+    Returns:
+        Encoded image as a bytes-like object.
+    """
+    try:
+        import cv2
+        import numpy as np
+    except ImportError:
+        cv2 = None
+
+    if cv2 is not None:
+        # cv2 expects BGR channel order
+        arr = np.ascontiguousarray(_image_to_array(image)[..., ::-1])
+        if fmt == "webp":
+            ext, params = ".webp", [int(cv2.IMWRITE_WEBP_QUALITY), quality]
+        else:
+            ext, params = ".jpg", [
+                int(cv2.IMWRITE_JPEG_QUALITY), quality,
+                int(cv2.IMWRITE_JPEG_PROGRESSIVE), 1,
+                int(cv2.IMWRITE_JPEG_OPTIMIZE), 1,
+            ]
+        ok, buf = cv2.imencode(ext, arr, params)
+        if ok:
+            return memoryview(buf).cast("B")
+
     buf = BytesIO()
-    image.save(buf, format="JPEG", quality=quality)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("utf-8")
+    if fmt == "webp":
+        image.save(buf, format="WEBP", quality=quality, method=4)
+    else:
+        image.save(
+            buf,
+            format="JPEG",
+            quality=quality,
+            progressive=True,
+            optimize=True,
+            subsampling=2,
+        )
+    return buf.getvalue()
+
+
+def _image_to_array(image: "Image.Image") -> "np.ndarray":
+    """Get a read-only (height, width, bands) uint8 view of a PIL Image's pixels.
+
+    ``np.asarray`` goes through ``Image.tobytes()``, which encodes in small
+    blocks and joins them. For large frames, the raw encoder is instead run
+    once with an output buffer sized to the whole image.
+
+    Args:
+        image: PIL Image.
+
+    Returns:
+        NumPy array of the image pixels.
+    """
+    import numpy as np
+    from PIL import Image
 
+    if image.width * image.height <= _RAW_ENCODE_MIN_PIXELS:
+        return np.asarray(image)
 
-def _generate_html(
+    image.load()
+    bands = len(image.getbands())
+    encoder = Image._getencoder(image.mode, "raw", image.mode)
+    encoder.setimage(image.im, (0, 0) + image.size)
+    _, errcode, data = encoder.encode(image.width * image.height * bands)
+    if errcode <= 0:
+        # Buffer was not large enough or the encoder failed; use the default path
+        return np.asarray(image)
+    shape = (image.height, image.width) + ((bands,) if bands > 1 else ())
+    return np.frombuffer(data, dtype=np.uint8).reshape(shape)
+
+
+def _iter_html_chunks(
     capture_id: str,
     duration: float,
     frames_data: list[dict],
     events_data: list[dict],
-    audio_b64: str,
+    audio_file: Path | None,
     audio_type: str,
     screen_width: int,
     screen_height: int,
     pixel_ratio: float,
     transcript: str = "",
-) -> str:
-    """Generate the HTML content.
+    video_src: str = "",
+    video_offset: float = 0.0,
+    frame_mime: str = "image/jpeg",
+    audio_src: str = "",
+    split_assets: bool = False,
+    frame_files: bool = False,
+) -> Iterator[bytes]:
+    """Generate the HTML content as a sequence of UTF-8 encoded chunks.
+
+    Frame payloads are already base64 (or URL) bytes and are emitted as-is
+    rather than being copied through a JSON encoder. Audio is read and
+    encoded in fixed-size chunks, so memory use does not grow with recording
+    length.
 
     Args:
         capture_id: Capture identifier.
         duration: Recording duration in seconds (audio duration if available).
         frames_data: List of frame data dicts.
         events_data: List of event data dicts.
-        audio_b64: Base64-encoded audio data.
+        audio_file: Audio file to embed, or None for no audio.
         transcript: Optional transcript text.
         audio_type: Audio MIME type.
         screen_width: Screen width in physical pixels.
         screen_height: Screen height in physical pixels.
         pixel_ratio: Display pixel ratio (physical/logical).
-
-    Returns:
-        Complete HTML string.
+        video_src: URL of the video to seek for frames (video_seek mode).
+        video_offset: Seconds from the first step to the video's start time.
+        frame_mime: MIME type of the embedded frame images.
+        audio_src: URL of a sidecar audio file, used instead of audio_file.
+        split_assets: Link ``viewer.css``/``viewer.js`` beside the HTML instead
+            of inlining them.
+        frame_files: Frame payloads are URLs of image files rather than
+            base64 data.
+
+    Yields:
+        Consecutive pieces of the HTML document.
     """
     # Format duration
     minutes = int(duration // 60)
     seconds = duration % 60
     duration_str = f"{minutes}:{seconds:05.2f}"
 
-    # Serialize data to JSON
-    frames_json = json.dumps(frames_data)
-    events_json = json.dumps(events_data)
-
     # Build conditional HTML sections (Python 3.10 compatible)
+    has_audio = audio_file is not None or bool(audio_src)
     audio_controls_html = ""
-    if audio_b64:
+    if has_audio:
         audio_controls_html = """
                     <div class="audio-controls">
                         <label>🔊 Volume</label>
@@ -310,556 +903,20 @@ def _generate_html(
                 </div>
         """
 
-    html = f'''<!DOCTYPE html>
+    if split_assets:
+        css_html = '<link rel="stylesheet" href="viewer.css">'
+        js_html = '<script src="viewer.js"></script>'
+    else:
+        css_html = f"<style>\n{_load_asset('viewer.css')}    </style>"
+        js_html = f"<script>\n{_load_asset('viewer.js')}    </script>"
+
+    yield f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Capture Viewer - {capture_id}</title>
-    <style>
-        :root {{
-            --bg-primary: #0a0a0f;
-            --bg-secondary: #12121a;
-            --bg-tertiary: #1a1a24;
-            --border-color: rgba(255, 255, 255, 0.06);
-            --text-primary: #f0f0f0;
-            --text-secondary: #888;
-            --text-muted: #555;
-            --accent: #00d4aa;
-            --accent-dim: rgba(0, 212, 170, 0.15);
-            --accent-hover: #00ffcc;
-            --click-color: #ff5f5f;
-            --drag-color: #00d4aa;
-            --scroll-color: #a78bfa;
-            --type-color: #34d399;
-        }}
-
-        * {{
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }}
-
-        body {{
-            font-family: "SF Pro Display", -apple-system, BlinkMacSystemFont, "Inter", sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            min-height: 100vh;
-            line-height: 1.5;
-        }}
-
-        .container {{
-            max-width: 1440px;
-            margin: 0 auto;
-            padding: 24px;
-        }}
-
-        header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 16px 24px;
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            margin-bottom: 24px;
-        }}
-
-        header h1 {{
-            font-size: 1.1rem;
-            font-weight: 600;
-            letter-spacing: -0.02em;
-            color: var(--text-primary);
-        }}
-
-        header .meta {{
-            color: var(--text-secondary);
-            font-size: 0.85rem;
-            font-family: "SF Mono", Monaco, "Cascadia Code", monospace;
-        }}
-
-        .step-nav {{
-            display: flex;
-            align-items: center;
-            gap: 12px;
-        }}
-
-        .step-counter {{
-            font-size: 1.2rem;
-            font-weight: 600;
-            color: var(--accent);
-            font-family: "SF Mono", Monaco, monospace;
-            min-width: 100px;
-            text-align: center;
-        }}
-
-        .step-nav button {{
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border-color);
-            color: var(--text-secondary);
-            width: 36px;
-            height: 36px;
-            border-radius: 8px;
-            cursor: pointer;
-            font-size: 1rem;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            transition: all 0.15s ease;
-        }}
-
-        .step-nav button:hover {{
-            background: var(--accent-dim);
-            color: var(--accent);
-            border-color: var(--accent);
-        }}
-
-        .step-nav button:disabled {{
-            opacity: 0.3;
-            cursor: not-allowed;
-        }}
-
-        .main-content {{
-            display: grid;
-            grid-template-columns: 1fr 340px;
-            gap: 24px;
-        }}
-
-        .viewer-section {{
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            overflow: hidden;
-        }}
-
-        .frame-container {{
-            position: relative;
-            background: #000;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            min-height: 420px;
-        }}
-
-        .frame-container img {{
-            max-width: 100%;
-            max-height: 70vh;
-            object-fit: contain;
-        }}
-
-        .frame-container canvas {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            pointer-events: none;
-        }}
-
-        .frame-overlay {{
-            position: absolute;
-            top: 12px;
-            right: 12px;
-            background: rgba(0, 0, 0, 0.75);
-            backdrop-filter: blur(8px);
-            padding: 6px 12px;
-            border-radius: 6px;
-            font-size: 0.8rem;
-            font-family: "SF Mono", Monaco, monospace;
-            border: 1px solid var(--border-color);
-        }}
-
-        .controls {{
-            padding: 16px 20px;
-            background: var(--bg-tertiary);
-            border-top: 1px solid var(--border-color);
-        }}
-
-        .playback-controls {{
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            margin-bottom: 16px;
-        }}
-
-        .playback-controls button {{
-            background: var(--accent);
-            border: none;
-            color: var(--bg-primary);
-            width: 40px;
-            height: 40px;
-            border-radius: 50%;
-            cursor: pointer;
-            font-size: 0.95rem;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            transition: all 0.15s ease;
-            font-weight: 600;
-        }}
-
-        .playback-controls button:hover {{
-            background: var(--accent-hover);
-            transform: scale(1.05);
-        }}
-
-        .playback-controls button.nav {{
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            color: var(--text-secondary);
-            width: 32px;
-            height: 32px;
-            font-size: 0.8rem;
-        }}
-
-        .playback-controls button.nav:hover {{
-            background: var(--bg-tertiary);
-            color: var(--text-primary);
-            border-color: rgba(255, 255, 255, 0.12);
-        }}
-
-        .time-display {{
-            font-family: "SF Mono", Monaco, monospace;
-            font-size: 0.85rem;
-            min-width: 110px;
-            color: var(--text-secondary);
-        }}
-
-        .timeline {{
-            width: 100%;
-            height: 6px;
-            background: var(--bg-secondary);
-            border-radius: 3px;
-            cursor: pointer;
-            position: relative;
-            border: 1px solid var(--border-color);
-        }}
-
-        .timeline-progress {{
-            height: 100%;
-            background: var(--accent);
-            border-radius: 3px;
-            width: 0%;
-            transition: width 0.1s;
-        }}
-
-        .timeline-markers {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-        }}
-
-        .timeline-marker {{
-            position: absolute;
-            width: 2px;
-            height: 100%;
-            background: rgba(255, 255, 255, 0.25);
-            transform: translateX(-50%);
-        }}
-
-        .audio-controls {{
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            margin-top: 16px;
-            padding-top: 16px;
-            border-top: 1px solid var(--border-color);
-        }}
-
-        .audio-controls label {{
-            font-size: 0.8rem;
-            color: var(--text-secondary);
-        }}
-
-        .audio-controls input[type="range"] {{
-            flex: 1;
-            max-width: 100px;
-            accent-color: var(--accent);
-        }}
-
-        .sidebar {{
-            display: flex;
-            flex-direction: column;
-            gap: 16px;
-        }}
-
-        .events-panel {{
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-            max-height: 50vh;
-        }}
-
-        .events-panel h2 {{
-            padding: 14px 18px;
-            font-size: 0.9rem;
-            font-weight: 600;
-            border-bottom: 1px solid var(--border-color);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            letter-spacing: -0.01em;
-        }}
-
-        .events-list {{
-            flex: 1;
-            overflow-y: auto;
-            padding: 8px;
-        }}
-
-        .events-list::-webkit-scrollbar {{
-            width: 6px;
-        }}
-
-        .events-list::-webkit-scrollbar-track {{
-            background: transparent;
-        }}
-
-        .events-list::-webkit-scrollbar-thumb {{
-            background: var(--bg-tertiary);
-            border-radius: 3px;
-        }}
-
-        .event-item {{
-            padding: 10px 14px;
-            border-radius: 8px;
-            cursor: pointer;
-            margin-bottom: 4px;
-            transition: all 0.15s ease;
-            font-size: 0.82rem;
-            border: 1px solid transparent;
-        }}
-
-        .event-item:hover {{
-            background: var(--bg-tertiary);
-            border-color: var(--border-color);
-        }}
-
-        .event-item.active {{
-            background: var(--accent-dim);
-            border-color: var(--accent);
-        }}
-
-        .event-item .event-time {{
-            color: var(--text-muted);
-            font-family: "SF Mono", Monaco, monospace;
-            margin-right: 10px;
-            font-size: 0.75rem;
-        }}
-
-        .event-item.active .event-time {{
-            color: var(--accent);
-        }}
-
-        .event-type {{
-            font-weight: 500;
-        }}
-
-        .event-type.click {{ color: var(--click-color); }}
-        .event-type.drag {{ color: var(--drag-color); }}
-        .event-type.scroll {{ color: var(--scroll-color); }}
-        .event-type.type {{ color: var(--type-color); }}
-
-        .event-item.active .event-type {{
-            color: var(--text-primary);
-        }}
-
-        .details-panel {{
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-            max-height: 30vh;
-        }}
-
-        .details-panel h2 {{
-            padding: 14px 18px;
-            font-size: 0.9rem;
-            font-weight: 600;
-            border-bottom: 1px solid var(--border-color);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .copy-btn {{
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border-color);
-            color: var(--text-secondary);
-            padding: 4px 10px;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 0.7rem;
-            transition: all 0.15s ease;
-            text-transform: uppercase;
-            letter-spacing: 0.03em;
-            font-weight: 500;
-        }}
-
-        .copy-btn:hover {{
-            background: var(--bg-secondary);
-            color: var(--text-primary);
-            border-color: rgba(255, 255, 255, 0.12);
-        }}
-
-        .copy-btn.copied {{
-            background: var(--accent-dim);
-            color: var(--accent);
-            border-color: var(--accent);
-        }}
-
-        .overlay-toggle {{
-            display: flex;
-            align-items: center;
-            margin-left: 12px;
-            gap: 8px;
-            cursor: pointer;
-            user-select: none;
-        }}
-
-        .overlay-toggle input {{
-            display: none;
-        }}
-
-        .toggle-slider {{
-            width: 36px;
-            height: 20px;
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: 10px;
-            position: relative;
-            transition: all 0.2s ease;
-        }}
-
-        .toggle-slider::after {{
-            content: '';
-            position: absolute;
-            width: 14px;
-            height: 14px;
-            background: var(--text-muted);
-            border-radius: 50%;
-            top: 2px;
-            left: 2px;
-            transition: all 0.2s ease;
-        }}
-
-        .overlay-toggle input:checked + .toggle-slider {{
-            background: var(--accent-dim);
-            border-color: var(--accent);
-        }}
-
-        .overlay-toggle input:checked + .toggle-slider::after {{
-            background: var(--accent);
-            left: 18px;
-        }}
-
-        .overlay-label {{
-            color: var(--text-secondary);
-            font-size: 0.8rem;
-            font-weight: 500;
-        }}
-
-        .overlay-toggle input:checked ~ .overlay-label {{
-            color: var(--text-primary);
-        }}
-
-        .details-content {{
-            padding: 14px 18px;
-            font-size: 0.82rem;
-            overflow-y: auto;
-            max-height: calc(30vh - 50px);
-        }}
-
-        .transcript-panel {{
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: 12px;
-        }}
-
-        .transcript-panel h2 {{
-            padding: 14px 18px;
-            font-size: 0.9rem;
-            font-weight: 600;
-            border-bottom: 1px solid var(--border-color);
-        }}
-
-        .transcript-content {{
-            padding: 14px 18px;
-            font-size: 0.85rem;
-            line-height: 1.9;
-            color: var(--text-secondary);
-            max-height: 150px;
-            overflow-y: auto;
-        }}
-
-        .transcript-segment {{
-            display: inline;
-            cursor: pointer;
-            padding: 2px 6px;
-            border-radius: 4px;
-            transition: all 0.15s ease;
-        }}
-
-        .transcript-segment:hover {{
-            background: var(--bg-tertiary);
-            color: var(--text-primary);
-        }}
-
-        .transcript-segment.active {{
-            background: var(--accent-dim);
-            color: var(--accent);
-        }}
-
-        .transcript-time {{
-            color: var(--text-muted);
-            font-size: 0.7rem;
-            font-family: "SF Mono", Monaco, monospace;
-            margin-right: 4px;
-        }}
-
-        .detail-row {{
-            display: flex;
-            margin-bottom: 6px;
-        }}
-
-        .detail-key {{
-            color: var(--text-muted);
-            min-width: 80px;
-            font-size: 0.75rem;
-            text-transform: uppercase;
-            letter-spacing: 0.03em;
-        }}
-
-        .detail-value {{
-            font-family: "SF Mono", Monaco, monospace;
-            color: var(--text-secondary);
-        }}
-
-        .keyboard-hint {{
-            text-align: center;
-            padding: 16px;
-            color: var(--text-muted);
-            font-size: 0.75rem;
-            letter-spacing: 0.02em;
-        }}
-
-        @media (max-width: 900px) {{
-            .main-content {{
-                grid-template-columns: 1fr;
-            }}
-
-            .sidebar {{
-                flex-direction: row;
-            }}
-
-            .events-panel, .details-panel {{
-                flex: 1;
-                max-height: 300px;
-            }}
-        }}
-    </style>
+    {css_html}
 </head>
 <body>
     <div class="container">
@@ -876,8 +933,7 @@ def _generate_html(
         <div class="main-content">
             <div class="viewer-section">
                 <div class="frame-container" id="frame-container">
-                    <img id="frame-image" src="" alt="Frame">
-                    <canvas id="overlay-canvas"></canvas>
+                    <canvas id="frame-canvas"></canvas>
                     <div class="frame-overlay" id="frame-time">0:00.00</div>
                 </div>
 
@@ -929,674 +985,130 @@ def _generate_html(
         </div>
     </div>
 
-    {"" if not audio_b64 else f'<audio id="audio" src="data:{audio_type};base64,{audio_b64}"></audio>'}
+    '''.encode()
+    if audio_file is not None:
+        yield f'<audio id="audio" src="data:{audio_type};base64,'.encode()
+        yield from _iter_file_base64(audio_file)
+        yield b'"></audio>'
+    elif audio_src:
+        yield f'<audio id="audio" src="{html_escape(audio_src)}" preload="auto"></audio>'.encode()
+    if video_src:
+        yield (
+            '<video id="frame-video" src="'
+            + html_escape(video_src)
+            + '" muted preload="auto" style="display:none"></video>'
+        ).encode()
+    yield b'''
 
     <script>
         // Data
-        const frames = {frames_json};
-        const events = {events_json};
+        const frameData = '''
+    yield from _iter_frames_json(frames_data)
+    yield b''';
+        const eventData = '''
+    yield _json_dumps([_compact_event(event) for event in events_data])
+    yield f''';
         const duration = {duration};
-        const hasAudio = {"true" if audio_b64 else "false"};
+        const hasAudio = {"true" if has_audio else "false"};
+        const videoSrc = {json.dumps(video_src)};
+        const videoOffset = {video_offset};
+        const frameMime = {json.dumps(frame_mime)};
+        const frameFiles = {"true" if frame_files else "false"};
         const screenWidth = {screen_width};
         const screenHeight = {screen_height};
         const pixelRatio = {pixel_ratio};
         const transcriptData = {transcript if transcript else '{"text": "", "segments": []}'};
-
-
-        // State
-        let currentIndex = 0;
-        let isPlaying = false;
-        let playInterval = null;
-        let showOverlay = true;
-
-        // Elements
-        const frameContainer = document.getElementById('frame-container');
-        const frameImage = document.getElementById('frame-image');
-        const overlayCanvas = document.getElementById('overlay-canvas');
-        const overlayCtx = overlayCanvas.getContext('2d');
-        const frameTime = document.getElementById('frame-time');
-        const currentTimeEl = document.getElementById('current-time');
-        const timelineProgress = document.getElementById('timeline-progress');
-        const timelineMarkers = document.getElementById('timeline-markers');
-        const eventsList = document.getElementById('events-list');
-        const detailsContent = document.getElementById('details-content');
-        const btnPlay = document.getElementById('btn-play');
-        const btnOverlay = document.getElementById('btn-overlay');
-        const btnCopy = document.getElementById('copy-btn');
-        const btnCopyAll = document.getElementById('copy-all-btn');
-        const audio = document.getElementById('audio');
-        const transcriptContent = document.getElementById('transcript-content');
-        const stepCounter = document.getElementById('step-counter');
-        const stepPrev = document.getElementById('step-prev');
-        const stepNext = document.getElementById('step-next');
-
-        // Current event for copying
-        let currentEvent = null;
-
-        // Initialize
-        function init() {{
-            // Render event markers on timeline
-            events.forEach((event, i) => {{
-                const marker = document.createElement('div');
-                marker.className = 'timeline-marker';
-                marker.style.left = (event.time / duration * 100) + '%';
-                timelineMarkers.appendChild(marker);
-            }});
-
-            // Render events list
-            events.forEach((event, i) => {{
-                const item = document.createElement('div');
-                item.className = 'event-item';
-                item.dataset.index = i;
-
-                const typeClass = getTypeClass(event.type);
-                const timeStr = formatTime(event.time);
-
-                item.innerHTML = `
-                    <span class="event-time">${{timeStr}}</span>
-                    <span class="event-type ${{typeClass}}">${{event.type}}</span>
-                `;
-
-                item.addEventListener('click', () => goToIndex(i));
-                eventsList.appendChild(item);
-            }});
-
-            // Render transcript segments if available
-            if (transcriptContent && transcriptData.segments && transcriptData.segments.length > 0) {{
-                transcriptData.segments.forEach((segment, i) => {{
-                    const span = document.createElement('span');
-                    span.className = 'transcript-segment';
-                    span.dataset.index = i;
-                    span.dataset.start = segment.start;
-                    span.dataset.end = segment.end;
-
-                    const timeSpan = document.createElement('span');
-                    timeSpan.className = 'transcript-time';
-                    timeSpan.textContent = formatTime(segment.start);
-                    span.appendChild(timeSpan);
-
-                    const textNode = document.createTextNode(segment.text + ' ');
-                    span.appendChild(textNode);
-
-                    span.addEventListener('click', () => seekToTranscript(segment.start));
-                    transcriptContent.appendChild(span);
-                }});
-            }} else if (transcriptContent && transcriptData.text) {{
-                // Fallback: show plain text if no segments
-                transcriptContent.textContent = transcriptData.text;
-            }}
-
-            // Show first frame
-            updateDisplay();
-
-            // Audio setup
-            if (hasAudio && audio) {{
-                const volumeSlider = document.getElementById('volume');
-                const muteCheckbox = document.getElementById('mute');
-
-                if (volumeSlider) {{
-                    volumeSlider.addEventListener('input', () => {{
-                        audio.volume = volumeSlider.value;
-                    }});
-                    audio.volume = volumeSlider.value;
-                }}
-
-                if (muteCheckbox) {{
-                    muteCheckbox.addEventListener('change', () => {{
-                        audio.muted = muteCheckbox.checked;
-                    }});
-                }}
-            }}
-        }}
-
-        function getTypeClass(type) {{
-            if (type.includes('click')) return 'click';
-            if (type.includes('drag')) return 'drag';
-            if (type.includes('scroll')) return 'scroll';
-            if (type.includes('type')) return 'type';
-            return '';
-        }}
-
-        function formatTime(seconds) {{
-            const mins = Math.floor(seconds / 60);
-            const secs = (seconds % 60).toFixed(2).padStart(5, '0');
-            return `${{mins}}:${{secs}}`;
-        }}
-
-        function drawOverlay(event) {{
-            // Get displayed image dimensions and position
-            const imgRect = frameImage.getBoundingClientRect();
-            const containerRect = frameContainer.getBoundingClientRect();
-
-            // Use actual image dimensions (naturalWidth/Height) for aspect ratio
-            // This handles Retina displays where image pixels != screen coordinates
-            const imgNaturalWidth = frameImage.naturalWidth || screenWidth;
-            const imgNaturalHeight = frameImage.naturalHeight || screenHeight;
-
-            // Scale ratio: image pixels / screen coordinates (e.g., 2.0 for Retina)
-            const pixelRatioX = imgNaturalWidth / screenWidth;
-            const pixelRatioY = imgNaturalHeight / screenHeight;
-
-            // Calculate actual displayed size (accounting for object-fit: contain)
-            const imgAspect = imgNaturalWidth / imgNaturalHeight;
-            const containerAspect = imgRect.width / imgRect.height;
-
-            let displayWidth, displayHeight, offsetX, offsetY;
-            if (imgAspect > containerAspect) {{
-                displayWidth = imgRect.width;
-                displayHeight = imgRect.width / imgAspect;
-                offsetX = 0;
-                offsetY = (imgRect.height - displayHeight) / 2;
-            }} else {{
-                displayHeight = imgRect.height;
-                displayWidth = imgRect.height * imgAspect;
-                offsetX = (imgRect.width - displayWidth) / 2;
-                offsetY = 0;
-            }}
-
-            // Set canvas size to match container
-            overlayCanvas.width = imgRect.width;
-            overlayCanvas.height = imgRect.height;
-            overlayCanvas.style.width = imgRect.width + 'px';
-            overlayCanvas.style.height = imgRect.height + 'px';
-
-            // Position canvas over image
-            const imgOffsetX = imgRect.left - containerRect.left;
-            const imgOffsetY = imgRect.top - containerRect.top;
-            overlayCanvas.style.left = imgOffsetX + 'px';
-            overlayCanvas.style.top = imgOffsetY + 'px';
-
-            // Clear canvas
-            overlayCtx.clearRect(0, 0, overlayCanvas.width, overlayCanvas.height);
-
-            if (!showOverlay) return;
-
-            // Scale factors: convert mouse coordinates to display pixels
-            // Native observer mouse coords are LOGICAL (e.g., 1512x982 on Retina)
-            // screenWidth/Height we stored are in PHYSICAL space (e.g., 3024x1964)
-            // pixelRatio = physical/logical (e.g., 2.0 for Retina)
-            //
-            // To map mouse coord to display:
-            // 1. mouseCoord * pixelRatio = physical image coord
-            // 2. physical image coord * (displayWidth / imgNaturalWidth) = display coord
-            const scaleX = (displayWidth / imgNaturalWidth) * pixelRatio;
-            const scaleY = (displayHeight / imgNaturalHeight) * pixelRatio;
-
-            // Draw based on event type
-            const type = event.type;
-
-            if (type.includes('click') || type === 'mouse.down' || type === 'mouse.up') {{
-                const x = offsetX + (event.x * scaleX);
-                const y = offsetY + (event.y * scaleY);
-                const radius = 20;
-
-                // Outer glow
-                overlayCtx.beginPath();
-                overlayCtx.arc(x, y, radius + 10, 0, Math.PI * 2);
-                overlayCtx.fillStyle = 'rgba(255, 100, 100, 0.3)';
-                overlayCtx.fill();
-
-                // Main circle
-                overlayCtx.beginPath();
-                overlayCtx.arc(x, y, radius, 0, Math.PI * 2);
-                overlayCtx.strokeStyle = '#ff5f5f';
-                overlayCtx.lineWidth = 3;
-                overlayCtx.stroke();
-
-                // Center dot
-                overlayCtx.beginPath();
-                overlayCtx.arc(x, y, 4, 0, Math.PI * 2);
-                overlayCtx.fillStyle = '#ff5f5f';
-                overlayCtx.fill();
-
-                // Crosshair
-                overlayCtx.beginPath();
-                overlayCtx.moveTo(x - radius - 5, y);
-                overlayCtx.lineTo(x - radius + 10, y);
-                overlayCtx.moveTo(x + radius - 10, y);
-                overlayCtx.lineTo(x + radius + 5, y);
-                overlayCtx.moveTo(x, y - radius - 5);
-                overlayCtx.lineTo(x, y - radius + 10);
-                overlayCtx.moveTo(x, y + radius - 10);
-                overlayCtx.lineTo(x, y + radius + 5);
-                overlayCtx.strokeStyle = '#ff5f5f';
-                overlayCtx.lineWidth = 2;
-                overlayCtx.stroke();
-
-            }} else if (type.includes('drag')) {{
-                const startX = offsetX + (event.x * scaleX);
-                const startY = offsetY + (event.y * scaleY);
-                // End position = start + delta
-                const endX = offsetX + ((event.x + event.dx) * scaleX);
-                const endY = offsetY + ((event.y + event.dy) * scaleY);
-
-                // Draw arrow from start to end
-                overlayCtx.beginPath();
-                overlayCtx.moveTo(startX, startY);
-                overlayCtx.lineTo(endX, endY);
-                overlayCtx.strokeStyle = '#00d4aa';
-                overlayCtx.lineWidth = 3;
-                overlayCtx.stroke();
-
-                // Start circle
-                overlayCtx.beginPath();
-                overlayCtx.arc(startX, startY, 8, 0, Math.PI * 2);
-                overlayCtx.fillStyle = '#00d4aa';
-                overlayCtx.fill();
-
-                // End arrowhead
-                const angle = Math.atan2(endY - startY, endX - startX);
-                overlayCtx.beginPath();
-                overlayCtx.moveTo(endX, endY);
-                overlayCtx.lineTo(endX - 15 * Math.cos(angle - 0.4), endY - 15 * Math.sin(angle - 0.4));
-                overlayCtx.lineTo(endX - 15 * Math.cos(angle + 0.4), endY - 15 * Math.sin(angle + 0.4));
-                overlayCtx.closePath();
-                overlayCtx.fillStyle = '#00d4aa';
-                overlayCtx.fill();
-
-            }} else if (type.includes('scroll')) {{
-                const x = offsetX + (event.x * scaleX);
-                const y = offsetY + (event.y * scaleY);
-
-                // Scroll indicator
-                overlayCtx.beginPath();
-                overlayCtx.arc(x, y, 15, 0, Math.PI * 2);
-                overlayCtx.strokeStyle = '#a78bfa';
-                overlayCtx.lineWidth = 2;
-                overlayCtx.stroke();
-
-                // Arrows indicating scroll direction
-                const dy = event.dy || 0;
-                if (dy !== 0) {{
-                    const arrowY = dy > 0 ? -25 : 25;
-                    overlayCtx.beginPath();
-                    overlayCtx.moveTo(x, y + arrowY);
-                    overlayCtx.lineTo(x - 8, y + arrowY + (dy > 0 ? 10 : -10));
-                    overlayCtx.lineTo(x + 8, y + arrowY + (dy > 0 ? 10 : -10));
-                    overlayCtx.closePath();
-                    overlayCtx.fillStyle = '#a78bfa';
-                    overlayCtx.fill();
-                }}
-
-            }} else if (type.includes('type')) {{
-                // Text bubble for keyboard input
-                const text = event.text || event.keys || '';
-                if (text) {{
-                    const bubbleX = 20;
-                    const bubbleY = overlayCanvas.height - 60;
-                    const padding = 10;
-
-                    overlayCtx.font = '16px monospace';
-                    const metrics = overlayCtx.measureText(text);
-                    const textWidth = Math.min(metrics.width, 300);
-
-                    // Background
-                    overlayCtx.fillStyle = 'rgba(52, 211, 153, 0.9)';
-                    overlayCtx.beginPath();
-                    overlayCtx.roundRect(bubbleX, bubbleY, textWidth + padding * 2, 36, 8);
-                    overlayCtx.fill();
-
-                    // Text
-                    overlayCtx.fillStyle = '#fff';
-                    overlayCtx.fillText(text.substring(0, 30), bubbleX + padding, bubbleY + 24);
-                }}
-            }}
-
-            // Draw label
-            let label = event.type.split('.').pop();
-            if (event.text) label += ': ' + event.text.substring(0, 20);
-            else if (event.keys) label += ': ' + event.keys;
-
-            overlayCtx.font = 'bold 14px sans-serif';
-            const labelMetrics = overlayCtx.measureText(label);
-            const labelX = 10;
-            const labelY = 30;
-
-            // Label background
-            overlayCtx.fillStyle = 'rgba(0, 0, 0, 0.7)';
-            overlayCtx.beginPath();
-            overlayCtx.roundRect(labelX - 5, labelY - 18, labelMetrics.width + 10, 24, 4);
-            overlayCtx.fill();
-
-            // Label text
-            overlayCtx.fillStyle = '#fff';
-            overlayCtx.fillText(label, labelX, labelY);
-        }}
-
-        function updateDisplay(skipAudioSync = false) {{
-            const frame = frames[currentIndex];
-            const event = events[currentIndex];
-
-            // Update frame
-            if (frame && frame.image) {{
-                frameImage.src = 'data:image/jpeg;base64,' + frame.image;
-                // Draw overlay after image loads
-                frameImage.onload = () => drawOverlay(event);
-            }}
-
-            // Draw overlay immediately if image already loaded
-            if (frameImage.complete) {{
-                setTimeout(() => drawOverlay(event), 0);
-            }}
-
-            // Update time displays
-            const timeStr = formatTime(event.time);
-            frameTime.textContent = timeStr;
-            if (!isPlaying) {{
-                currentTimeEl.textContent = timeStr;
-            }}
-
-            // Update timeline (only if not playing - playback updates this directly)
-            if (!isPlaying) {{
-                const progress = (event.time / duration) * 100;
-                timelineProgress.style.width = progress + '%';
-            }}
-
-            // Update events list
-            document.querySelectorAll('.event-item').forEach((item, i) => {{
-                item.classList.toggle('active', i === currentIndex);
-            }});
-
-            // Scroll active event into view
-            const activeItem = eventsList.querySelector('.event-item.active');
-            if (activeItem) {{
-                activeItem.scrollIntoView({{ block: 'nearest', behavior: 'smooth' }});
-            }}
-
-            // Update details
-            updateDetails(event);
-
-            // Update step counter
-            updateStepCounter();
-
-            // Sync audio only on manual navigation, not during playback
-            if (hasAudio && audio && !skipAudioSync && !isPlaying) {{
-                audio.currentTime = event.time;
-            }}
-        }}
-
-        function updateStepCounter() {{
-            stepCounter.textContent = `Step ${{currentIndex + 1}} / ${{frames.length}}`;
-            stepPrev.disabled = currentIndex === 0;
-            stepNext.disabled = currentIndex === frames.length - 1;
-        }}
-
-        function updateDetails(event) {{
-            currentEvent = event;
-            let html = '';
-            for (const [key, value] of Object.entries(event)) {{
-                if (key === 'index') continue;
-                const displayValue = key === 'time' ? formatTime(value) : value;
-                html += `<div class="detail-row">
-                    <span class="detail-key">${{key}}:</span>
-                    <span class="detail-value">${{displayValue ?? '-'}}</span>
-                </div>`;
-            }}
-            detailsContent.innerHTML = html;
-        }}
-
-        function formatEventForCopy(event) {{
-            const lines = [];
-            for (const [key, value] of Object.entries(event)) {{
-                if (key === 'index') continue;
-                const displayValue = key === 'time' ? formatTime(value) : value;
-                lines.push(`${{key}}: ${{displayValue ?? '-'}}`);
-            }}
-            return lines.join('\\n');
-        }}
-
-        function copyEventDetails() {{
-            if (!currentEvent) return;
-
-            const text = formatEventForCopy(currentEvent);
-
-            navigator.clipboard.writeText(text).then(() => {{
-                btnCopy.textContent = 'Copied!';
-                btnCopy.classList.add('copied');
-                setTimeout(() => {{
-                    btnCopy.textContent = 'Copy';
-                    btnCopy.classList.remove('copied');
-                }}, 1500);
-            }});
-        }}
-
-        function copyAllEvents() {{
-            const allText = events.map((event, i) => {{
-                return `--- Event ${{i + 1}} ---\\n${{formatEventForCopy(event)}}`;
-            }}).join('\\n\\n');
-
-            navigator.clipboard.writeText(allText).then(() => {{
-                btnCopyAll.textContent = 'Copied!';
-                btnCopyAll.classList.add('copied');
-                setTimeout(() => {{
-                    btnCopyAll.textContent = 'Copy All';
-                    btnCopyAll.classList.remove('copied');
-                }}, 1500);
-            }});
-        }}
-
-        function goToIndex(index) {{
-            currentIndex = Math.max(0, Math.min(frames.length - 1, index));
-            // If playing, pause first so we can seek properly
-            if (isPlaying) {{
-                togglePlay();
-            }}
-            updateDisplay();
-            // Force audio sync for navigation
-            if (hasAudio && audio) {{
-                const targetTime = events[currentIndex].time;
-                audio.currentTime = targetTime;
-                updateActiveTranscript(targetTime);
-            }}
-        }}
-
-        function seekToTranscript(time) {{
-            // Seek audio to transcript segment time
-            if (hasAudio && audio) {{
-                audio.currentTime = time;
-                // Find the closest event to this time
-                let closest = 0;
-                let minDiff = Infinity;
-                events.forEach((event, i) => {{
-                    const diff = Math.abs(event.time - time);
-                    if (diff < minDiff) {{
-                        minDiff = diff;
-                        closest = i;
-                    }}
-                }});
-                currentIndex = closest;
-                updateDisplay(true);  // skip audio sync since we just set it
-                updateActiveTranscript(time);
-            }}
-        }}
-
-        function updateActiveTranscript(currentTime) {{
-            if (!transcriptContent) return;
-            const segments = transcriptContent.querySelectorAll('.transcript-segment');
-            segments.forEach(segment => {{
-                const start = parseFloat(segment.dataset.start);
-                const end = parseFloat(segment.dataset.end);
-                const isActive = currentTime >= start && currentTime < end;
-                segment.classList.toggle('active', isActive);
-                if (isActive) {{
-                    segment.scrollIntoView({{ block: 'nearest', behavior: 'smooth' }});
-                }}
-            }});
-        }}
-
-        function next() {{
-            if (currentIndex < frames.length - 1) {{
-                currentIndex++;
-                updateDisplay();
-            }} else if (isPlaying) {{
-                togglePlay();
-            }}
-        }}
-
-        function prev() {{
-            if (currentIndex > 0) {{
-                currentIndex--;
-                updateDisplay();
-            }}
-        }}
-
-        function togglePlay() {{
-            isPlaying = !isPlaying;
-            btnPlay.textContent = isPlaying ? '⏸' : '▶';
-
-            if (isPlaying) {{
-                // Start audio from current event time
-                if (hasAudio && audio) {{
-                    audio.currentTime = events[currentIndex].time;
-                    audio.play();
-                }}
-                // Use audio timeupdate to drive event updates, or fallback timer
-                if (hasAudio && audio) {{
-                    audio.ontimeupdate = () => {{
-                        if (!isPlaying) return;
-                        const currentTime = audio.currentTime;
-                        // Find the event that matches current audio time
-                        let newIndex = currentIndex;
-                        for (let i = 0; i < events.length; i++) {{
-                            if (events[i].time <= currentTime) {{
-                                newIndex = i;
-                            }} else {{
-                                break;
-                            }}
-                        }}
-                        if (newIndex !== currentIndex) {{
-                            currentIndex = newIndex;
-                            updateDisplay(true);  // skip audio sync
-                        }}
-                        // Update timeline progress
-                        const percent = (currentTime / duration) * 100;
-                        timelineProgress.style.width = percent + '%';
-                        currentTimeEl.textContent = formatTime(currentTime);
-                        // Update active transcript segment
-                        updateActiveTranscript(currentTime);
-                    }};
-                    audio.onended = () => {{
-                        isPlaying = false;
-                        btnPlay.textContent = '▶';
-                    }};
-                }} else {{
-                    // No audio: use timer-based playback at real speed
-                    const startTime = events[currentIndex].time;
-                    const startRealTime = Date.now();
-                    playInterval = setInterval(() => {{
-                        const elapsed = (Date.now() - startRealTime) / 1000;
-                        const currentTime = startTime + elapsed;
-                        // Find matching event
-                        let newIndex = currentIndex;
-                        for (let i = currentIndex; i < events.length; i++) {{
-                            if (events[i].time <= currentTime) {{
-                                newIndex = i;
-                            }} else {{
-                                break;
-                            }}
-                        }}
-                        if (newIndex !== currentIndex) {{
-                            currentIndex = newIndex;
-                            updateDisplay();
-                        }}
-                        // Update timeline
-                        const percent = (currentTime / duration) * 100;
-                        timelineProgress.style.width = percent + '%';
-                        currentTimeEl.textContent = formatTime(currentTime);
-                        // Stop at end
-                        if (currentTime >= duration) {{
-                            togglePlay();
-                        }}
-                    }}, 50);
-                }}
-            }} else {{
-                if (hasAudio && audio) {{
-                    audio.pause();
-                    audio.ontimeupdate = null;
-                    audio.onended = null;
-                }}
-                clearInterval(playInterval);
-            }}
-        }}
-
-        function toggleOverlay() {{
-            showOverlay = !showOverlay;
-            btnOverlay.checked = showOverlay;
-            drawOverlay(events[currentIndex]);
-        }}
-
-        // Event listeners
-        document.getElementById('btn-play').addEventListener('click', togglePlay);
-        document.getElementById('btn-next').addEventListener('click', next);
-        document.getElementById('btn-prev').addEventListener('click', prev);
-        document.getElementById('btn-first').addEventListener('click', () => goToIndex(0));
-        document.getElementById('btn-last').addEventListener('click', () => goToIndex(frames.length - 1));
-        stepPrev.addEventListener('click', prev);
-        stepNext.addEventListener('click', next);
-        btnCopy.addEventListener('click', copyEventDetails);
-        btnCopyAll.addEventListener('click', copyAllEvents);
-        btnOverlay.addEventListener('change', () => {{
-            showOverlay = btnOverlay.checked;
-            drawOverlay(events[currentIndex]);
-        }});
-
-        document.getElementById('timeline').addEventListener('click', (e) => {{
-            const rect = e.target.getBoundingClientRect();
-            const x = e.clientX - rect.left;
-            const percent = x / rect.width;
-            const targetTime = percent * duration;
-
-            // Find closest frame
-            let closest = 0;
-            let minDiff = Infinity;
-            frames.forEach((frame, i) => {{
-                const diff = Math.abs(frame.time - targetTime);
-                if (diff < minDiff) {{
-                    minDiff = diff;
-                    closest = i;
-                }}
-            }});
-
-            goToIndex(closest);
-        }});
-
-        // Keyboard shortcuts
-        document.addEventListener('keydown', (e) => {{
-            if (e.target.tagName === 'INPUT') return;
-
-            switch (e.code) {{
-                case 'Space':
-                    e.preventDefault();
-                    togglePlay();
-                    break;
-                case 'ArrowRight':
-                    e.preventDefault();
-                    next();
-                    break;
-                case 'ArrowLeft':
-                    e.preventDefault();
-                    prev();
-                    break;
-                case 'Home':
-                    e.preventDefault();
-                    goToIndex(0);
-                    break;
-                case 'End':
-                    e.preventDefault();
-                    goToIndex(frames.length - 1);
-                    break;
-                case 'KeyO':
-                    e.preventDefault();
-                    toggleOverlay();
-                    break;
-            }}
-        }});
-
-        // Initialize
-        init();
     </script>
+    {js_html}
 </body>
 </html>
-'''
+'''.encode()
+
+
+def _iter_file_base64(path: Path) -> Iterator[bytes]:
+    """Base64-encode a file in bounded chunks.
+
+    Args:
+        path: File to encode.
+
+    Yields:
+        Consecutive pieces of the base64 encoding as ASCII bytes.
+    """
+    with open(path, "rb") as f:
+        while chunk := f.read(_AUDIO_CHUNK_SIZE):
+            yield base64.b64encode(chunk)
+
+
+def _json_dumps(obj: object) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes.
 
-    return html
+    Uses ``orjson`` when installed, which is several times faster than the
+    standard library encoder and returns bytes directly.
+
+    Args:
+        obj: JSON-serializable object.
+
+    Returns:
+        Compact JSON document as bytes.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return _JSON_ENCODER.encode(obj).encode()
+
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    except TypeError:
+        # Types orjson does not handle (e.g. float subclasses); the standard
+        # encoder accepts them
+        return _JSON_ENCODER.encode(obj).encode()
+
+
+def _compact_event(event: dict) -> dict:
+    """Shrink an event dict for embedding in the viewer.
+
+    Drops the index (it equals the array position), None values and zero
+    deltas, stores the time as integer milliseconds, rounds coordinates to
+    hundredths of a pixel and shortens key names via ``_EVENT_KEYS``.
+
+    Args:
+        event: Event dict as built by ``create_html``.
+
+    Returns:
+        Compact event dict.
+    """
+    compact = {}
+    for key, value in event.items():
+        if key == "index" or value is None:
+            continue
+        if key == "time":
+            value = round(value * 1000)
+        elif key in ("x", "y", "dx", "dy"):
+            value = round(value, 2)
+            if not value and key in ("dx", "dy"):
+                continue
+        compact[_EVENT_KEYS.get(key, key)] = value
+    return compact
+
+
+def _iter_frames_json(frames_data: list[dict]) -> Iterator[bytes]:
+    """Serialize frame images to a compact JSON array of strings.
+
+    Frames pair one-to-one with events, so the viewer takes each frame's
+    index and time from its position and the matching event rather than
+    embedding them twice. Each image payload is written directly, so no
+    frame is copied into an intermediate string.
+
+    Args:
+        frames_data: Frame dicts whose ``image`` value is base64 data or an
+            image URL, as ASCII bytes.
+
+    Yields:
+        Consecutive pieces of the JSON array.
+    """
+    yield b"["
+    for i, frame in enumerate(frames_data):
+        yield b',"' if i else b'"'
+        yield frame["image"]
+        yield b'"'
+    yield b"]"
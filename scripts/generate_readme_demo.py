@@ -86,6 +86,7 @@ def generate_html_viewer(capture_dir: Path, output_path: Path) -> None:
         output=output_path,
         max_events=100,
         include_audio=True,
+        embed_audio=True,
         frame_scale=0.75,
     )
     print(f"  Saved: {output_path}")
@@ -6,6 +6,8 @@ and runs them in identical conditions for a fair comparison.
 Usage:
     cd /Users/abrichr/oa/src/openadapt-capture
     uv run python scripts/legacy_vs_new_benchmark.py
+    OPENADAPT_BENCHMARK_CODEC=libsvtav1 uv run python scripts/legacy_vs_new_benchmark.py
+    OPENADAPT_BENCHMARK_GRABBER=bettercam uv run python scripts/legacy_vs_new_benchmark.py
 """
 
 import multiprocessing
@@ -15,17 +17,111 @@ import signal
 import sys
 import threading
 import time
-from collections import namedtuple
+from collections import deque, namedtuple
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
 
 import mss
 import mss.base
+import numpy as np
 import psutil
-from PIL import Image
 
 if sys.platform == "win32":
-    import mss.windows
-    mss.windows.CAPTUREBLT = 0
+    # Skip layered windows in BitBlt; the flag lives in mss.windows.gdi
+    # since mss 10, where setting it on mss.windows has no effect
+    try:
+        import mss.windows.gdi as mss_windows
+    except ImportError:
+        import mss.windows as mss_windows
+    mss_windows.CAPTUREBLT = 0
+
+# Encoder settings shared by both writers so only the capture pipeline
+# differs, as codec -> (pixel format, options). The default libx264 profile
+# stays lossless (crf=0) like the package's VideoWriter; "faster" instead of
+# "veryslow" stops motion search from backing up the write queue. Set
+# OPENADAPT_BENCHMARK_CODEC=libsvtav1 for SVT-AV1's fastest preset, which
+# encodes screen content several times faster at a lossy crf
+VIDEO_ENCODINGS = {
+    "libx264": ("yuv444p", {"crf": "0", "preset": "faster"}),
+    "libsvtav1": ("yuv420p", {"preset": "12", "crf": "30"}),
+}
+VIDEO_CODEC = os.environ.get("OPENADAPT_BENCHMARK_CODEC", "libx264")
+if VIDEO_CODEC not in VIDEO_ENCODINGS:
+    raise SystemExit(
+        f"Unsupported OPENADAPT_BENCHMARK_CODEC {VIDEO_CODEC!r}; "
+        f"expected one of {', '.join(VIDEO_ENCODINGS)}"
+    )
+VIDEO_PIX_FMT, VIDEO_OPTIONS = VIDEO_ENCODINGS[VIDEO_CODEC]
+
+# Frames the new pattern can have in flight to its writer process. Each is a
+# slot in one shared-memory block, so frames are not pickled through a pipe
+FRAME_SLOTS = 8
+
+# Screenshot source for the new pattern. "mss" matches ScreenCapturer;
+# "bettercam" (Windows, optional) reads the primary display through DXGI
+# Desktop Duplication instead of a GDI BitBlt per grab
+SCREEN_GRABBER = os.environ.get("OPENADAPT_BENCHMARK_GRABBER", "mss")
+if SCREEN_GRABBER not in ("mss", "bettercam"):
+    raise SystemExit(
+        f"Unsupported OPENADAPT_BENCHMARK_GRABBER {SCREEN_GRABBER!r}; expected mss or bettercam"
+    )
+
+
+def _add_video_stream(container, width, height, fps):
+    """Add the benchmark's video stream, configured identically for both writers."""
+    stream = container.add_stream(VIDEO_CODEC, rate=fps)
+    stream.width = width
+    stream.height = height
+    stream.pix_fmt = VIDEO_PIX_FMT
+    stream.options = dict(VIDEO_OPTIONS)
+    # PyAV defaults to slice threading, which x264 runs as sliced threads;
+    # frame threading keeps more cores busy. A count of 0 lets the encoder
+    # pick one per core
+    stream.thread_type = "FRAME"
+    stream.thread_count = 0
+    return stream
+
+
+def _pin_writer(writer_pid):
+    """Give the writer process its own cores so encoding cannot preempt capture.
+
+    The first two allowed cores go to this process (the capture threads) and
+    the rest to the writer.
+
+    Returns:
+        This process's previous affinity, to restore after the run, or None
+        when affinity is unsupported (macOS) or fewer than four cores are
+        available.
+    """
+    main = psutil.Process()
+    if not hasattr(main, "cpu_affinity"):
+        return None
+    try:
+        previous = main.cpu_affinity()
+        if len(previous) < 4:
+            return None
+        psutil.Process(writer_pid).cpu_affinity(previous[2:])
+        main.cpu_affinity(previous[:2])
+    except (psutil.Error, OSError):
+        return None
+    return previous
+
+
+def _unpin(previous):
+    """Restore the affinity returned by _pin_writer."""
+    if previous is not None:
+        psutil.Process().cpu_affinity(previous)
+
+
+def _screen_size(monitor_index):
+    """Pixel size of an mss monitor, without grabbing it where possible."""
+    with mss.mss() as sct:
+        monitor = sct.monitors[monitor_index]
+        if sys.platform == "darwin":
+            # macOS monitors are in points, screenshots in (Retina) pixels
+            return sct.grab(monitor).size
+    return monitor["width"], monitor["height"]
+
 
 # ===================================================================
 # Legacy Pattern (from OpenAdapt/legacy/openadapt/record.py)
@@ -36,6 +132,10 @@ Event = namedtuple("Event", ("timestamp", "type", "data"))
 
 def _legacy_take_screenshot(sct, monitor):
     """Matches legacy utils.take_screenshot()."""
+    # Only the legacy pattern uses Pillow; importing it here keeps it out of
+    # the new pattern's processes
+    from PIL import Image
+
     sct_img = sct.grab(monitor)
     return Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
 
@@ -96,11 +196,7 @@ def _legacy_video_writer(video_write_q, video_path, width, height, fps, terminat
     signal.signal(signal.SIGINT, signal.SIG_IGN)
 
     container = av.open(str(video_path), mode="w")
-    stream = container.add_stream("libx264", rate=fps)
-    stream.width = width
-    stream.height = height
-    stream.pix_fmt = "yuv444p"
-    stream.options = {"crf": "0", "preset": "veryslow"}
+    stream = _add_video_stream(container, width, height, fps)
 
     start_ts = None
     last_pts = 0
@@ -165,12 +261,7 @@ def run_legacy_benchmark(output_dir, duration, record_full_video=False):
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Get screen dims
-    sct = mss.mss()
-    monitor = sct.monitors[0]
-    sct_img = sct.grab(monitor)
-    width, height = sct_img.size
-    del sct
+    width, height = _screen_size(0)
 
     event_q = queue.Queue()
     video_write_q = multiprocessing.Queue()
@@ -184,6 +275,7 @@ def run_legacy_benchmark(output_dir, duration, record_full_video=False):
         args=(video_write_q, str(video_path), width, height, 24, terminate_processing),
     )
     video_proc.start()
+    affinity = _pin_writer(video_proc.pid)
 
     # Start process_events thread
     process_thread = threading.Thread(
@@ -209,24 +301,40 @@ def run_legacy_benchmark(output_dir, duration, record_full_video=False):
     video_proc.join(timeout=30)
     if video_proc.is_alive():
         video_proc.terminate()
+    _unpin(affinity)
 
 
 # ===================================================================
 # New Pattern (from openadapt-capture)
 # ===================================================================
 
-def _new_video_writer_worker(q, video_path, width, height, fps):
-    """New video encoder process — matches recorder.py _video_writer_worker."""
+def _new_video_writer_worker(q, video_path, width, height, fps, shm_name=None, free_slots=None):
+    """New video encoder process — matches recorder.py _video_writer_worker.
+
+    Queue items are ``(frame, size, timestamp)`` where frame is either BGRA
+    bytes or the index of a slot in the shared-memory block ``shm_name``,
+    which is handed back on ``free_slots`` once encoded. Timestamps are
+    ``time.monotonic_ns()`` values, so wall-clock adjustments cannot move
+    frames backwards and PTS math stays in integers.
+    """
     import av
 
     signal.signal(signal.SIGINT, signal.SIG_IGN)
 
+    shm = SharedMemory(name=shm_name) if shm_name else None
+    slot_size = width * height * 4
+
     container = av.open(str(video_path), mode="w")
-    stream = container.add_stream("libx264", rate=fps)
-    stream.width = width
-    stream.height = height
-    stream.pix_fmt = "yuv444p"
-    stream.options = {"crf": "0", "preset": "veryslow"}
+    stream = _add_video_stream(container, width, height, fps)
+
+    # One input frame is refilled for every screen-sized picture. encode()
+    # converts it to the stream's pixel format first, so the encoder never
+    # keeps a reference to it
+    input_frame = av.VideoFrame(width, height, "bgra")
+    input_plane = input_frame.planes[0]
+    input_rows = np.frombuffer(input_plane, dtype=np.uint8).reshape(
+        height, input_plane.line_size
+    )[:, :width * 4]
 
     start_ts = None
     last_pts = -1
@@ -239,50 +347,113 @@ def _new_video_writer_worker(q, video_path, width, height, fps):
         if item is None:
             break
 
-        image_bytes, size, timestamp = item
-        image = Image.frombytes("RGB", size, image_bytes)
+        frame, size, timestamp = item
+        # Wrap the BGRA pixels in place; libswscale converts them to the
+        # stream's pixel format during encode
+        width_px, height_px = size
+        if isinstance(frame, int):
+            image = np.frombuffer(
+                shm.buf, dtype=np.uint8, count=height_px * width_px * 4, offset=frame * slot_size
+            )
+        else:
+            image = np.frombuffer(frame, dtype=np.uint8)
+        image = image.reshape(height_px, width_px, 4)
 
         if start_ts is None:
             start_ts = timestamp
 
-        av_frame = av.VideoFrame.from_image(image)
+        if size == (width, height):
+            input_rows[:] = image.reshape(height, width * 4)
+            av_frame = input_frame
+            av_frame.pict_type = av.video.frame.PictureType.NONE
+        else:
+            av_frame = av.VideoFrame.from_ndarray(image, format="bgra")
+        # The pixels were copied into the frame, so the slot can be refilled
+        del image
+        if isinstance(frame, int):
+            free_slots.put(frame)
         if is_first:
             av_frame.pict_type = av.video.frame.PictureType.I
             is_first = False
 
-        time_diff = timestamp - start_ts
-        pts = int(time_diff * fps)
+        pts = (timestamp - start_ts) * fps // 1_000_000_000
         if pts <= last_pts:
             pts = last_pts + 1
         av_frame.pts = pts
         last_pts = pts
 
-        for packet in stream.encode(av_frame):
+        packets = stream.encode(av_frame)
+        for packet in packets:
             packet.pts = pts
-            container.mux(packet)
+        # One mux call per frame rather than per packet; FFmpeg buffers the
+        # file writes itself
+        container.mux(packets)
 
-        last_frame = image
+        last_frame = av_frame
         last_frame_ts = timestamp
 
     # Finalize
-    if last_frame and last_frame_ts and start_ts:
-        av_frame = av.VideoFrame.from_image(last_frame)
+    if last_frame is not None and last_frame_ts and start_ts:
+        av_frame = last_frame
         av_frame.pict_type = av.video.frame.PictureType.I
-        time_diff = last_frame_ts - start_ts
-        pts = int(time_diff * fps)
+        pts = (last_frame_ts - start_ts) * fps // 1_000_000_000
         if pts <= last_pts:
             pts = last_pts + 1
         av_frame.pts = pts
-        for packet in stream.encode(av_frame):
+        packets = stream.encode(av_frame)
+        for packet in packets:
             packet.pts = pts
-            container.mux(packet)
+        container.mux(packets)
 
-    for packet in stream.encode():
-        container.mux(packet)
+    container.mux(stream.encode())
 
-    close_thread = threading.Thread(target=container.close)
-    close_thread.start()
-    close_thread.join()
+    # This process owns the container exclusively and the parent only waits on
+    # join(), so close() runs directly instead of via the legacy close thread.
+    container.close()
+    if shm is not None:
+        shm.close()
+
+
+class _BGRAFrame:
+    """Minimal stand-in for an mss ScreenShot over a BGRA ndarray."""
+
+    __slots__ = ("_array",)
+
+    def __init__(self, array):
+        self._array = array
+
+    @property
+    def raw(self):
+        return self._array.reshape(-1)
+
+    @property
+    def bgra(self):
+        return self._array.tobytes()
+
+    @property
+    def size(self):
+        height, width = self._array.shape[:2]
+        return width, height
+
+
+def _open_bettercam(fps):
+    """Start a bettercam capture of the primary display.
+
+    Returns:
+        The started camera, or None when not on Windows or bettercam is not
+        installed.
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        import bettercam
+    except ImportError:
+        return None
+    camera = bettercam.create(output_idx=0, output_color="BGRA")
+    # Video mode paces get_latest_frame() to the target rate, repeating the
+    # last frame when the screen is unchanged, like the mss polling loop
+    camera.start(target_fps=fps, video_mode=True)
+    return camera
 
 
 def run_new_benchmark(output_dir, duration, record_full_video=False):
@@ -290,65 +461,103 @@ def run_new_benchmark(output_dir, duration, record_full_video=False):
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Get screen dims
-    sct_init = mss.mss()
-    monitor = sct_init.monitors[0]
-    sct_img = sct_init.grab(monitor)
-    width, height = sct_img.size
-    del sct_init
+    # Open the grabber before probing the frame size, so the shared-memory
+    # slots are sized for the monitor actually captured: bettercam captures
+    # only the primary display, the mss fallback all of them
+    camera = _open_bettercam(24) if SCREEN_GRABBER == "bettercam" else None
+    if SCREEN_GRABBER == "bettercam" and camera is None:
+        print("  bettercam unavailable; capturing all monitors with mss")
+    width, height = _screen_size(1 if camera is not None else 0)
 
     video_path = output_dir / "video.mp4"
     video_q = multiprocessing.Queue()
 
+    # Frames go through a ring of shared-memory slots; only slot indices
+    # cross the process boundary
+    slot_size = width * height * 4
+    shm = SharedMemory(create=True, size=slot_size * FRAME_SLOTS)
+    free_slots = multiprocessing.Queue()
+    for slot in range(FRAME_SLOTS):
+        free_slots.put(slot)
+
     # Start video writer process
     video_proc = multiprocessing.Process(
         target=_new_video_writer_worker,
-        args=(video_q, str(video_path), width, height, 24),
+        args=(video_q, str(video_path), width, height, 24, shm.name, free_slots),
         daemon=False,
     )
     video_proc.start()
-
-    # Action-gated state
-    prev_screen_image = None
-    prev_screen_timestamp = 0.0
-    prev_saved_screen_timestamp = 0.0
+    affinity = _pin_writer(video_proc.pid)
+
+    def put_frame(image, timestamp):
+        raw = image.raw
+        if len(raw) > slot_size:
+            # Larger than the probed screen (resolution changed): send inline
+            video_q.put((image.bgra, image.size, timestamp))
+            return
+        # Blocks while the writer holds every slot, bounding memory
+        slot = free_slots.get()
+        shm.buf[slot * slot_size:slot * slot_size + len(raw)] = raw
+        video_q.put((slot, image.size, timestamp))
+
+    # Action-gated state: the latest unsaved (image, timestamp). append()
+    # replaces it and popleft() claims it atomically, so the two threads never
+    # pair an image with another frame's timestamp and a saved frame is not
+    # kept alive until the next one arrives
+    latest_frame = deque(maxlen=1)
+    # Set when latest_frame is filled (and on shutdown), so the action
+    # thread sleeps until there is something to save instead of polling
+    frame_ready = threading.Event()
     frame_count = 0
     stop_event = threading.Event()
 
     def on_screen_frame(image, timestamp):
-        nonlocal prev_screen_image, prev_screen_timestamp, frame_count
+        nonlocal frame_count
         if record_full_video:
-            video_q.put((image.tobytes(), image.size, timestamp))
+            put_frame(image, timestamp)
         else:
-            prev_screen_image = image
-            prev_screen_timestamp = timestamp
+            latest_frame.append((image, timestamp))
+            frame_ready.set()
         frame_count += 1
 
     def simulate_actions():
         """Simulate action-gated frame writes at ~5 actions/sec."""
-        nonlocal prev_saved_screen_timestamp
-        while not stop_event.is_set():
-            if (
-                not record_full_video
-                and prev_screen_image is not None
-                and prev_screen_timestamp > prev_saved_screen_timestamp
-            ):
-                image = prev_screen_image
-                video_q.put((image.tobytes(), image.size, prev_screen_timestamp))
-                prev_saved_screen_timestamp = prev_screen_timestamp
+        while True:
+            frame_ready.wait()
+            if stop_event.is_set():
+                break
+            frame_ready.clear()
+            try:
+                image, timestamp = latest_frame.popleft()
+            except IndexError:
+                pass  # already claimed after the event was set
+            else:
+                put_frame(image, timestamp)
             stop_event.wait(0.2)  # ~5 actions/sec
 
+    def bettercam_loop(camera):
+        """Screenshot capture thread fed by a DXGI duplication camera."""
+        try:
+            while not stop_event.is_set():
+                frame = camera.get_latest_frame()
+                on_screen_frame(_BGRAFrame(frame), time.monotonic_ns())
+        finally:
+            camera.stop()
+
     def capture_loop():
         """Screenshot capture thread — matches ScreenCapturer._capture_loop."""
+        if camera is not None:
+            bettercam_loop(camera)
+            return
         sct = mss.mss()
         mon = sct.monitors[0]
         interval = 1.0 / 24.0
         while not stop_event.is_set():
-            ts = time.time()
-            sct_img = sct.grab(mon)
-            screenshot = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-            on_screen_frame(screenshot, ts)
-            elapsed = time.time() - ts
+            ts = time.monotonic_ns()
+            # Hand on the raw BGRA screenshot; the encoder converts it
+            # natively, so there is no per-pixel repack into RGB here
+            on_screen_frame(sct.grab(mon), ts)
+            elapsed = (time.monotonic_ns() - ts) / 1e9
             sleep_time = max(0, interval - elapsed)
             if sleep_time > 0:
                 stop_event.wait(sleep_time)
@@ -364,24 +573,40 @@ def run_new_benchmark(output_dir, duration, record_full_video=False):
 
     # Shutdown (new pattern: set stop, sentinel, join)
     stop_event.set()
+    frame_ready.set()
     capture_thread.join(timeout=2)
     action_thread.join(timeout=2)
     video_q.put(None)  # Sentinel
     video_proc.join(timeout=30)
     if video_proc.is_alive():
         video_proc.terminate()
+    _unpin(affinity)
+    shm.close()
+    shm.unlink()
 
 
 # ===================================================================
 # Benchmark Runner
 # ===================================================================
 
+# Memory samples between refreshes of the sampled process's child list
+CHILDREN_REFRESH_SAMPLES = 20
+
+
 def sample_memory(pid, interval, samples, stop_event):
     proc = psutil.Process(pid)
+    # Listing children scans every process on the system, and the benchmark
+    # only ever spawns its writer process, so the list is reused between
+    # refreshes (and re-read while empty, since the writer starts after us)
+    children = []
+    since_refresh = 0
     while not stop_event.is_set():
         try:
             main_rss = proc.memory_info().rss / (1024 * 1024)
-            children = proc.children(recursive=True)
+            if not children or since_refresh >= CHILDREN_REFRESH_SAMPLES:
+                children = proc.children(recursive=True)
+                since_refresh = 0
+            since_refresh += 1
             child_rss = sum(c.memory_info().rss / (1024 * 1024) for c in children)
             samples.append({
                 "time": time.time(),
@@ -390,7 +615,8 @@ def sample_memory(pid, interval, samples, stop_event):
                 "total_rss_mb": main_rss + child_rss,
             })
         except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+            # A child may have exited; list them again next time
+            children = []
         stop_event.wait(interval)
 
 
@@ -453,7 +679,8 @@ def main():
     duration = 15
 
     print(f"Benchmark: {duration}s recording, action-gated mode (~5 fps to encoder)")
-    print(f"Each test uses identical video encoding: libx264/yuv444p/crf=0/veryslow")
+    encoding = f"crf={VIDEO_OPTIONS['crf']}/{VIDEO_OPTIONS['preset']}"
+    print(f"Each test uses identical video encoding: {VIDEO_CODEC}/{VIDEO_PIX_FMT}/{encoding}")
 
     # Run legacy pattern
     legacy_samples = run_benchmark(
@@ -519,7 +746,7 @@ def main():
         ax.grid(True, alpha=0.3)
 
         plt.suptitle(
-            f"Legacy vs New Recording Pattern ({duration}s, action-gated, crf=0/veryslow)",
+            f"Legacy vs New Recording Pattern ({duration}s, action-gated, {encoding})",
             fontsize=14,
         )
         plt.tight_layout()
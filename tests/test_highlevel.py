@@ -3,66 +3,170 @@
 Updated for legacy-style SQLAlchemy storage.
 """
 
+import contextlib
 import multiprocessing
-import tempfile
+import os
+import shutil
+import sqlite3
+import sys
 import threading
 import time
-from pathlib import Path
 
 import pytest
+import sqlalchemy as sa
 
 from openadapt_capture import recorder as recorder_module
 from openadapt_capture import video
 from openadapt_capture.capture import Capture, InvalidCaptureEvent
-from openadapt_capture.db import create_db, crud
+from openadapt_capture.db import create_db, crud, get_engine, get_session_maker
 from openadapt_capture.platform import DisplayMetricsUnavailable
 from openadapt_capture.recorder import Recorder
 
-# Sessions/engines created by _create_test_recording, released by the
-# temp_capture_dir teardown BEFORE the TemporaryDirectory is removed. Both
-# must be released: crud.insert_recording ends with session.refresh(), which
-# leaves the connection checked out until the session closes, and the engine
-# pool keeps the SQLite file handle open until dispose(). On Windows an open
-# recording.db makes the rmtree fail with WinError 32 (sharing violation).
-_HELPER_SESSIONS = []
-_HELPER_ENGINES = []
-
-
-@pytest.fixture
-def temp_capture_dir():
-    """Create a temporary directory for captures."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
-        while _HELPER_SESSIONS:
-            _HELPER_SESSIONS.pop().close()
-        while _HELPER_ENGINES:
-            _HELPER_ENGINES.pop().dispose()
-
-
-def _create_test_recording(capture_dir, task_description="Test task"):
-    """Create a minimal recording for testing (no real input capture)."""
-    import os
-    import sys
-
-    os.makedirs(capture_dir, exist_ok=True)
-    db_path = os.path.join(capture_dir, "recording.db")
-    engine, Session = create_db(db_path)
-    _HELPER_ENGINES.append(engine)
-    session = Session()
-    _HELPER_SESSIONS.append(session)
-
-    timestamp = time.time()
+# Recording fields _create_test_recording shares across every test
+_BASE_RECORDING = {
+    "monitor_width": 1920,
+    "monitor_height": 1080,
+    "double_click_interval_seconds": 0.5,
+    "double_click_distance_pixels": 5,
+    "platform": sys.platform,
+}
+
+# Action-event payloads shared by several tests; crud copies them on insert
+CLICK_DOWN = {
+    "name": "click",
+    "mouse_x": 100.0,
+    "mouse_y": 100.0,
+    "mouse_button_name": "left",
+    "mouse_pressed": True,
+}
+CLICK_UP = {**CLICK_DOWN, "mouse_pressed": False}
+
+
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory):
+    """Build the recording.db schema once; tests start from a copy of it."""
+    db_path = tmp_path_factory.mktemp("template") / "recording.db"
+    engine, _ = create_db(str(db_path))
+    engine.dispose()
+    return db_path
+
+
+@pytest.fixture(scope="class")
+def class_tmp(tmp_path_factory):
+    """One directory per test class, for in-memory captures that never write.
+
+    _create_memory_capture only records capture_dir on the capture, so its
+    tests can share a directory instead of each getting a fresh tmp_path.
+    """
+    return tmp_path_factory.mktemp("cap")
+
+
+def _skip_disk_sync(dbapi_connection, _connection_record):
+    """Keep setup writes off the disk: no fsync, journal or temp files.
+
+    The copy is thrown away after the test, so durability buys nothing; the
+    rows still land in recording.db for Capture.load to read.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _insert_test_recording(session, task_description, events):
+    """Insert the recording row and its action events in one batch."""
     recording_data = {
-        "timestamp": timestamp,
-        "monitor_width": 1920,
-        "monitor_height": 1080,
-        "double_click_interval_seconds": 0.5,
-        "double_click_distance_pixels": 5,
-        "platform": sys.platform,
+        **_BASE_RECORDING,
+        "timestamp": time.time(),
         "task_description": task_description,
     }
-    recording = crud.insert_recording(session, recording_data)
-    return recording, db_path, session
+    recording = crud.insert_recording_core(session, recording_data)
+    crud.insert_action_events(session, recording, [
+        (recording.timestamp + offset, data) for offset, data in events
+    ])
+    return recording
+
+
+def _create_test_recording(
+    capture_dir, template_db, task_description="Test task", events=()
+):
+    """Create a minimal recording for testing (no real input capture).
+
+    The setup session and engine are closed before returning, so the only
+    handle on recording.db is the one Capture.load opens. An open handle
+    would also keep Windows from removing tmp_path (WinError 32).
+
+    Args:
+        capture_dir: Directory to create recording.db in.
+        template_db: Path from the template_db fixture.
+        task_description: Task description stored on the recording.
+        events: (offset, data) action events, offset in seconds after the
+            recording timestamp, inserted in one batch.
+
+    Returns:
+        tuple of (recording id, db path).
+    """
+    os.makedirs(capture_dir, exist_ok=True)
+    db_path = os.path.join(capture_dir, "recording.db")
+    shutil.copyfile(template_db, db_path)
+    engine = get_engine(f"sqlite:///{db_path}")
+    sa.event.listen(engine, "connect", _skip_disk_sync)
+    session = get_session_maker(engine)()
+    try:
+        recording = _insert_test_recording(session, task_description, events)
+        return recording.id, db_path
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _create_memory_capture(
+    capture_dir, template_db, task_description="Test task", events=()
+):
+    """Like _create_test_recording, but in memory and already loaded.
+
+    For tests of what a loaded capture returns rather than of reading
+    recording.db: the template schema is copied into an in-memory database
+    and the writing session is handed to Capture.from_session, so nothing
+    touches the disk. capture_dir is only recorded on the capture.
+
+    Returns:
+        The loaded Capture; closing it discards the database.
+    """
+    # StaticPool keeps the one connection (and so the database) alive for
+    # every checkout until the capture disposes the engine
+    engine = sa.create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=sa.pool.StaticPool,
+    )
+    connection = engine.raw_connection()
+    template = sqlite3.connect(template_db)
+    try:
+        template.backup(connection.driver_connection)
+    finally:
+        template.close()
+        connection.close()
+    session = get_session_maker(engine)()
+    recording = _insert_test_recording(session, task_description, events)
+    return Capture.from_session(session, recording.id, capture_dir=capture_dir)
+
+
+@contextlib.contextmanager
+def _count_queries(capture):
+    """Collect the SQL statements a capture's engine runs inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = capture._session.get_bind()
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
 
 
 class TestRecorder:
@@ -119,6 +223,17 @@ class TestRecorder:
         rec = Recorder("/tmp/test_never_created")
         assert callable(rec.wait_for_ready)
 
+    def test_recorder_wait_for_events(self):
+        """Test wait_for_events returns once the action counter reaches the target."""
+        rec = Recorder("/tmp/test_never_created")
+        assert rec.wait_for_events(0, timeout=0)
+        assert rec.wait_for_events(1, timeout=0.1) is False
+
+        threading.Timer(0.05, lambda: setattr(rec._num_action_events, "value", 3)).start()
+        start = time.monotonic()
+        assert rec.wait_for_events(3, timeout=10)
+        assert time.monotonic() - start < 5
+
     def test_recorder_capture_property_before_recording(self):
         """Test Recorder.capture is None before recording."""
         rec = Recorder("/tmp/test_never_created")
@@ -214,29 +329,25 @@ class TestRecorder:
 class TestCapture:
     """Tests for Capture/CaptureSession class."""
 
-    def test_capture_load(self, temp_capture_dir):
+    def test_capture_load(self, tmp_path, template_db):
         """Test loading a capture."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(
-            capture_path, "Test"
-        )
+        capture_path = str(tmp_path / "capture")
+        _create_test_recording(capture_path, template_db, "Test")
 
         capture = Capture.load(capture_path)
         assert capture.task_description == "Test"
         assert capture.id is not None
         capture.close()
 
-    def test_capture_load_nonexistent(self, temp_capture_dir):
+    def test_capture_load_nonexistent(self, tmp_path):
         """Test loading nonexistent capture raises error."""
         with pytest.raises(FileNotFoundError):
-            Capture.load(Path(temp_capture_dir) / "nonexistent")
+            Capture.load(tmp_path / "nonexistent")
 
-    def test_capture_properties(self, temp_capture_dir):
+    def test_capture_properties(self, tmp_path, template_db):
         """Test capture metadata properties."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(
-            capture_path, "Props test"
-        )
+        capture_path = str(tmp_path / "capture")
+        _create_test_recording(capture_path, template_db, "Props test")
 
         capture = Capture.load(capture_path)
         assert capture.started_at is not None
@@ -246,62 +357,68 @@ class TestCapture:
         assert capture.task_description == "Props test"
         capture.close()
 
-    def test_capture_actions_iterator(self, temp_capture_dir):
+    def test_capture_actions_iterator(self, class_tmp, template_db):
         """Test iterating over actions."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
-
-        # Insert action events directly via crud
-        ts = recording.timestamp
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "click",
-            "mouse_x": 100.0,
-            "mouse_y": 100.0,
-            "mouse_button_name": "left",
-            "mouse_pressed": True,
-        })
-        crud.insert_action_event(session, recording, ts + 0.002, {
-            "name": "click",
-            "mouse_x": 100.0,
-            "mouse_y": 100.0,
-            "mouse_button_name": "left",
-            "mouse_pressed": False,
-        })
+        # A press/release pair, inserted directly into the DB
+        capture = _create_memory_capture(class_tmp, template_db, events=[
+            (0.001, CLICK_DOWN),
+            (0.002, CLICK_UP),
+        ])
 
-        # Load and iterate
-        capture = Capture.load(capture_path)
-        actions = list(capture.actions())
+        action = next(capture.actions(), None)
 
         # Should have merged into a click
-        assert len(actions) >= 1
+        assert action is not None
         capture.close()
 
-    def test_capture_context_manager(self, temp_capture_dir):
+    def test_capture_from_session(self, tmp_path, template_db):
+        """Test wrapping the session that wrote the recording."""
+        capture_path = tmp_path / "capture"
+        capture_path.mkdir()
+        db_path = capture_path / "recording.db"
+        shutil.copyfile(template_db, db_path)
+        session = get_session_maker(get_engine(f"sqlite:///{db_path}"))()
+        recording = crud.insert_recording(session, {
+            **_BASE_RECORDING,
+            "timestamp": time.time(),
+            "task_description": "From session",
+        })
+        crud.insert_action_events(session, recording, [
+            (recording.timestamp + 0.001, {"name": "move", "mouse_x": 1.0, "mouse_y": 2.0}),
+        ])
+
+        with Capture.from_session(session, recording.id) as capture:
+            assert capture.capture_dir == capture_path
+            assert capture.task_description == "From session"
+            assert len(capture.raw_events()) == 1
+
+    def test_capture_from_memory_session_needs_capture_dir(self):
+        """Test an in-memory session without capture_dir is closed and rejected."""
+        session = get_session_maker(sa.create_engine("sqlite://"))()
+        session.execute(sa.text("SELECT 1"))
+        assert session.in_transaction()
+
+        with pytest.raises(ValueError, match="capture_dir is required"):
+            Capture.from_session(session)
+        assert not session.in_transaction()
+
+    def test_capture_context_manager(self, tmp_path, template_db):
         """Test Capture as context manager."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        _create_test_recording(capture_path)
+        capture_path = str(tmp_path / "capture")
+        _create_test_recording(capture_path, template_db)
 
         with Capture.load(capture_path) as capture:
             assert capture.id is not None
 
-    def test_capture_raw_events(self, temp_capture_dir):
+    def test_capture_raw_events(self, class_tmp, template_db):
         """Test raw_events returns Pydantic events from SQLAlchemy DB."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
-
-        ts = recording.timestamp
         # Insert various event types
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "move", "mouse_x": 50.0, "mouse_y": 60.0,
-        })
-        crud.insert_action_event(session, recording, ts + 0.002, {
-            "name": "press", "key_char": "a",
-        })
-        crud.insert_action_event(session, recording, ts + 0.003, {
-            "name": "release", "key_char": "a",
-        })
+        capture = _create_memory_capture(class_tmp, template_db, events=[
+            (0.001, {"name": "move", "mouse_x": 50.0, "mouse_y": 60.0}),
+            (0.002, {"name": "press", "key_char": "a"}),
+            (0.003, {"name": "release", "key_char": "a"}),
+        ])
 
-        capture = Capture.load(capture_path)
         events = capture.raw_events()
         assert len(events) == 3
         assert events[0].type == "mouse.move"
@@ -309,141 +426,90 @@ class TestCapture:
         assert events[2].type == "key.up"
         capture.close()
 
-
-class TestAction:
-    """Tests for Action dataclass."""
-
-    def test_action_properties(self, temp_capture_dir):
-        """Test Action property accessors."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
-
-        ts = recording.timestamp
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "click",
-            "mouse_x": 150.0,
-            "mouse_y": 250.0,
-            "mouse_button_name": "left",
-            "mouse_pressed": True,
-        })
-        crud.insert_action_event(session, recording, ts + 0.002, {
-            "name": "click",
-            "mouse_x": 150.0,
-            "mouse_y": 250.0,
-            "mouse_button_name": "left",
-            "mouse_pressed": False,
-        })
-
-        capture = Capture.load(capture_path)
-        actions = list(capture.actions())
-
-        if actions:
-            action = actions[0]
-            assert action.timestamp > 0
-            assert action.type is not None
-            # Click should have x, y
-            if action.x is not None:
-                assert action.x == 150.0
-                assert action.y == 250.0
-
+    def test_event_queries_do_not_grow_with_events(self, class_tmp, template_db):
+        """raw_events/actions/ended_at each cost one query, however many events."""
+        capture = _create_memory_capture(class_tmp, template_db, events=[
+            (0.001 * i, {"name": "move", "mouse_x": float(i), "mouse_y": 60.0})
+            for i in range(1, 31)
+        ])
+
+        for read in (
+            lambda: len(capture.raw_events()) == 30,
+            lambda: len(list(capture.actions(include_moves=True))) > 0,
+            lambda: capture.ended_at is not None,
+        ):
+            with _count_queries(capture) as statements:
+                assert read()
+            assert len(statements) == 1
         capture.close()
 
-    def test_action_scroll_properties(self, temp_capture_dir):
-        """Test Action dx/dy properties for scroll events."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
-
-        ts = recording.timestamp
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "scroll",
-            "mouse_x": 200.0,
-            "mouse_y": 300.0,
-            "mouse_dx": 0.0,
-            "mouse_dy": -3.0,
-        })
 
-        capture = Capture.load(capture_path)
-        actions = list(capture.actions())
-        assert len(actions) == 1
-        action = actions[0]
-        assert action.x == 200.0
-        assert action.y == 300.0
-        assert action.dx == 0.0
-        assert action.dy == -3.0
-        assert action.type == "mouse.scroll"
-        capture.close()
+ACTION_SHAPE_CASES = [
+    pytest.param(
+        [CLICK_DOWN, CLICK_UP],
+        {"type": "mouse.singleclick", "x": 100.0, "y": 100.0, "button": "left"},
+        id="click",
+    ),
+    pytest.param(
+        [
+            {
+                "name": "scroll",
+                "mouse_x": 200.0,
+                "mouse_y": 300.0,
+                "mouse_dx": 0.0,
+                "mouse_dy": -3.0,
+            },
+        ],
+        {"type": "mouse.scroll", "x": 200.0, "y": 300.0, "dx": 0.0, "dy": -3.0},
+        id="scroll",
+    ),
+    pytest.param(
+        [
+            {"name": "press", "key_char": "h"},
+            {"name": "release", "key_char": "h"},
+        ],
+        # Keyboard actions have no dx/dy/button; the text comes from KeyTypeEvent
+        {"type": "key.type", "dx": None, "dy": None, "button": None, "text": "h"},
+        id="keyboard",
+    ),
+]
 
-    def test_action_click_button_property(self, temp_capture_dir):
-        """Test Action button property for click events."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
-
-        ts = recording.timestamp
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "click",
-            "mouse_x": 100.0,
-            "mouse_y": 100.0,
-            "mouse_button_name": "left",
-            "mouse_pressed": True,
-        })
-        crud.insert_action_event(session, recording, ts + 0.002, {
-            "name": "click",
-            "mouse_x": 100.0,
-            "mouse_y": 100.0,
-            "mouse_button_name": "left",
-            "mouse_pressed": False,
-        })
 
-        capture = Capture.load(capture_path)
-        actions = list(capture.actions())
-        assert len(actions) >= 1
-        assert actions[0].button == "left"
-        capture.close()
-
-    def test_action_keyboard_no_dx_dy(self, temp_capture_dir):
-        """Test that keyboard actions return None for dx/dy/button."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
+class TestAction:
+    """Tests for Action dataclass."""
 
-        ts = recording.timestamp
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "press", "key_char": "h",
-        })
-        crud.insert_action_event(session, recording, ts + 0.002, {
-            "name": "release", "key_char": "h",
-        })
+    @pytest.mark.parametrize("events,expected", ACTION_SHAPE_CASES)
+    def test_action_shape(self, class_tmp, template_db, events, expected):
+        """Test Action property accessors for each kind of action."""
+        capture = _create_memory_capture(class_tmp, template_db, events=[
+            (0.001 * (i + 1), event) for i, event in enumerate(events)
+        ])
 
-        capture = Capture.load(capture_path)
         actions = list(capture.actions())
-        assert len(actions) >= 1
+        assert len(actions) == 1
         action = actions[0]
-        assert action.dx is None
-        assert action.dy is None
-        assert action.button is None
-        assert action.text is not None  # Should be "h" from KeyTypeEvent
+        assert action.timestamp > 0
+        for name, value in expected.items():
+            assert getattr(action, name) == value, name
         capture.close()
 
 
 class TestCaptureEdgeCases:
     """Tests for edge cases and bug fixes."""
 
-    def test_empty_recording(self, temp_capture_dir):
+    def test_empty_recording(self, class_tmp, template_db):
         """Test loading a recording with zero events."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        _create_test_recording(capture_path, "Empty test")
+        capture = _create_memory_capture(class_tmp, template_db, "Empty test")
 
-        capture = Capture.load(capture_path)
         assert list(capture.actions()) == []
         assert capture.raw_events() == []
         assert capture.ended_at is None
         assert capture.duration is None
         capture.close()
 
-    def test_session_leak_on_no_recording(self, temp_capture_dir):
+    def test_session_leak_on_no_recording(self, tmp_path):
         """Test that session is closed when no recording found in DB."""
-        import os
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        os.makedirs(capture_path, exist_ok=True)
+        capture_path = str(tmp_path / "capture")
         db_path = os.path.join(capture_path, "recording.db")
         # Create DB with tables but no recording row (dispose the setup
         # engine so only Capture.load's own handle is under test)
@@ -453,52 +519,47 @@ class TestCaptureEdgeCases:
         with pytest.raises(FileNotFoundError, match="no recording found"):
             Capture.load(capture_path)
 
-    def test_mouse_pressed_none_is_refused(self, temp_capture_dir):
+    def test_mouse_pressed_none_is_refused(self, class_tmp, template_db):
         """A corrupt click cannot disappear from the replay event stream."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
-
-        ts = recording.timestamp
         # Insert a click with mouse_pressed=None (corrupt data)
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "click",
-            "mouse_x": 100.0,
-            "mouse_y": 100.0,
-            "mouse_button_name": "left",
-            # mouse_pressed intentionally omitted -> defaults to None
-        })
-        # Insert a valid move event
-        crud.insert_action_event(session, recording, ts + 0.002, {
-            "name": "move",
-            "mouse_x": 200.0,
-            "mouse_y": 200.0,
-        })
+        capture = _create_memory_capture(class_tmp, template_db, events=[
+            (0.001, {
+                "name": "click",
+                "mouse_x": 100.0,
+                "mouse_y": 100.0,
+                "mouse_button_name": "left",
+                # mouse_pressed intentionally omitted -> defaults to None
+            }),
+            # Insert a valid move event
+            (0.002, {
+                "name": "move",
+                "mouse_x": 200.0,
+                "mouse_y": 200.0,
+            }),
+        ])
 
-        capture = Capture.load(capture_path)
         with pytest.raises(InvalidCaptureEvent, match="pressed/released"):
             capture.raw_events()
         capture.close()
 
-    def test_disabled_events_filtered(self, temp_capture_dir):
+    def test_disabled_events_filtered(self, tmp_path, template_db):
         """Test that disabled events are filtered out."""
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        recording, db_path, session = _create_test_recording(capture_path)
-
-        ts = recording.timestamp
-        crud.insert_action_event(session, recording, ts + 0.001, {
-            "name": "move", "mouse_x": 50.0, "mouse_y": 60.0,
-        })
-        crud.insert_action_event(session, recording, ts + 0.002, {
-            "name": "move", "mouse_x": 70.0, "mouse_y": 80.0,
-        })
+        capture_path = str(tmp_path / "capture")
+        _, db_path = _create_test_recording(capture_path, template_db, events=[
+            (0.001, {"name": "move", "mouse_x": 50.0, "mouse_y": 60.0}),
+            (0.002, {"name": "move", "mouse_x": 70.0, "mouse_y": 80.0}),
+        ])
 
         # Disable the second event directly in the DB
         from openadapt_capture.db.models import ActionEvent
-        disabled_event = session.query(ActionEvent).filter(
-            ActionEvent.mouse_x == 70.0
-        ).first()
-        disabled_event.disabled = True
-        session.commit()
+        engine = get_engine(f"sqlite:///{db_path}")
+        with engine.begin() as conn:
+            conn.execute(
+                sa.update(ActionEvent)
+                .where(ActionEvent.mouse_x == 70.0)
+                .values(disabled=True)
+            )
+        engine.dispose()
 
         capture = Capture.load(capture_path)
         events = capture.raw_events()
@@ -506,17 +567,16 @@ class TestCaptureEdgeCases:
         assert events[0].x == 50.0
         capture.close()
 
-    def test_capture_load_corrupt_db(self, temp_capture_dir):
+    def test_capture_load_corrupt_db(self, tmp_path):
         """Test loading a corrupt database file raises an error."""
-        import os
-        capture_path = str(Path(temp_capture_dir) / "capture")
+        capture_path = str(tmp_path / "capture")
         os.makedirs(capture_path, exist_ok=True)
         db_path = os.path.join(capture_path, "recording.db")
         # Write garbage to simulate corruption
         with open(db_path, "w") as f:
             f.write("this is not a sqlite database")
 
-        with pytest.raises(Exception):
+        with pytest.raises(FileNotFoundError, match="not a SQLite database"):
             Capture.load(capture_path)
 
 
@@ -578,14 +638,11 @@ class TestRecordingConfig:
 class TestPixelRatio:
     """Tests for pixel_ratio persistence on the SQLAlchemy Recording model."""
 
-    def test_pixel_ratio_round_trips_through_model(self, temp_capture_dir):
+    def test_pixel_ratio_round_trips_through_model(self, tmp_path):
         """A HiDPI pixel_ratio written to the model survives load."""
-        import os
         import sqlite3
-        import sys
 
-        capture_path = str(Path(temp_capture_dir) / "capture")
-        os.makedirs(capture_path, exist_ok=True)
+        capture_path = str(tmp_path / "capture")
         db_path = os.path.join(capture_path, "recording.db")
         engine, Session = create_db(db_path)
         session = Session()
@@ -615,20 +672,17 @@ class TestPixelRatio:
         assert capture.pixel_ratio == 2.0
         capture.close()
 
-    def test_old_recording_without_column_loads(self, temp_capture_dir):
+    def test_old_recording_without_column_loads(self, tmp_path):
         """A recording.db predating the pixel_ratio column still loads.
 
         The additive migration adds the column (NULL for existing rows) so
         the query does not fail, and pixel_ratio falls back to the config
         JSON, then to 1.0 when genuinely unknown.
         """
-        import os
         import sqlite3
-        import sys
 
         # config-JSON fallback preserved.
-        capture_path = str(Path(temp_capture_dir) / "old_with_config")
-        os.makedirs(capture_path, exist_ok=True)
+        capture_path = str(tmp_path / "old_with_config")
         db_path = os.path.join(capture_path, "recording.db")
         engine, Session = create_db(db_path)
         session = Session()
@@ -659,8 +713,7 @@ class TestPixelRatio:
         capture.close()
 
         # No column and no config -> genuinely unknown -> refuse.
-        capture_path2 = str(Path(temp_capture_dir) / "old_no_config")
-        os.makedirs(capture_path2, exist_ok=True)
+        capture_path2 = str(tmp_path / "old_no_config")
         db_path2 = os.path.join(capture_path2, "recording.db")
         engine2, Session2 = create_db(db_path2)
         session2 = Session2()
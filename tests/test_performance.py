@@ -52,6 +52,9 @@ _INJECTION_SKIP_REASON = (
     "hold (hosted CI runner limitation, not a recorder bug)"
 )
 
+# Seconds of synthetic input recorded by the shared_capture_dir fixture
+SHARED_DURATION = 3
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -69,47 +72,85 @@ def _generate_synthetic_input(duration: float, stop_event: threading.Event) -> i
     mouse = MouseController()
     keyboard = KeyboardController()
 
-    start = time.time()
+    # Each input gets its own 40ms slot on a fixed schedule; sleeping until
+    # the slot's deadline (not for a flat 40ms) keeps oversleeps and the
+    # time spent injecting from accumulating into drift
+    step = 0.04
+    start = time.monotonic()
+    slot = 0
+
+    def wait_for_next_slot():
+        nonlocal slot
+        slot += 1
+        time.sleep(max(0.0, start + slot * step - time.monotonic()))
+
     i = 0
-    while time.time() - start < duration and not stop_event.is_set():
+    while time.monotonic() - start < duration and not stop_event.is_set():
         # Move mouse in a small pattern
         x_offset = (i % 10) * 10
         y_offset = (i % 5) * 10
         mouse.position = (100 + x_offset, 100 + y_offset)
-        time.sleep(0.04)
+        wait_for_next_slot()
 
         # Click every 10th iteration
         if i % 10 == 0:
             mouse.click(Button.left)
-            time.sleep(0.04)
+            wait_for_next_slot()
 
         # Type a character every 20th iteration
         if i % 20 == 0:
             keyboard.press("a")
             keyboard.release("a")
-            time.sleep(0.04)
+            wait_for_next_slot()
 
         i += 1
     return i
 
 
-def _sample_memory(pid: int, interval: float, samples: list, stop: threading.Event):
-    """Sample RSS of process + children at regular intervals."""
+def _peak_rss_bytes(proc: psutil.Process, info) -> int | None:
+    """Return one process's peak resident set in bytes, if the platform has one.
+
+    Windows reports the peak working set through psutil; Linux reads VmHWM
+    from /proc, and for this process falls back to ru_maxrss. Elsewhere (a
+    child on macOS) there is no per-process peak and None is returned.
+    """
+    peak = getattr(info, "peak_wset", None)
+    if peak is not None:
+        return peak
+    try:
+        with open(f"/proc/{proc.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if proc.pid == os.getpid():
+        import resource
+
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+    return None
+
+
+def _tree_memory_mb(pid: int) -> tuple[float, float | None]:
+    """Return (rss, peak) in MB, summed over a process and its children.
+
+    peak is None when any process in the tree has no peak reading (see
+    _peak_rss_bytes), rather than silently substituting the current RSS.
+    """
     proc = psutil.Process(pid)
-    while not stop.is_set():
+    rss = peak = 0
+    for p in [proc, *proc.children(recursive=True)]:
         try:
-            main_mb = proc.memory_info().rss / (1024 * 1024)
-            children = proc.children(recursive=True)
-            child_mb = sum(c.memory_info().rss / (1024 * 1024) for c in children)
-            samples.append({
-                "time": time.time(),
-                "main_mb": main_mb,
-                "child_mb": child_mb,
-                "total_mb": main_mb + child_mb,
-            })
+            info = p.memory_info()
         except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
-        stop.wait(interval)
+            continue
+        rss += info.rss
+        p_peak = _peak_rss_bytes(p, info)
+        peak = None if peak is None or p_peak is None else peak + p_peak
+    rss_mb = rss / (1024 * 1024)
+    return rss_mb, None if peak is None else peak / (1024 * 1024)
 
 
 # ---------------------------------------------------------------------------
@@ -124,6 +165,33 @@ def capture_dir(tmp_path):
     # Cleanup handled by tmp_path
 
 
+@pytest.fixture(scope="class")
+def shared_capture_dir(tmp_path_factory):
+    """Record synthetic input once for the tests that only read it back.
+
+    Each Recorder start spawns the writer processes, which on Windows
+    re-import every module, so the assertion-only tests share one run.
+    """
+    d = str(tmp_path_factory.mktemp("shared") / "perf_capture")
+    input_stop = threading.Event()
+
+    with Recorder(d, task_description="Integration test") as rec:
+        # Wait until listeners + writers are actually up (cold CI runners
+        # can take several seconds; a fixed sleep races the startup).
+        assert rec.wait_for_ready(timeout=120), "recorder failed to start"
+
+        def run_input():
+            _generate_synthetic_input(SHARED_DURATION, input_stop)
+
+        t = threading.Thread(target=run_input, daemon=True)
+        t.start()
+        time.sleep(SHARED_DURATION)
+        input_stop.set()
+        t.join(timeout=5)
+
+    return d
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -134,30 +202,10 @@ class TestRecorderIntegration:
     """Integration tests that run the full recording pipeline."""
 
     @pytest.mark.skipif(_NO_INPUT_INJECTION, reason=_INJECTION_SKIP_REASON)
-    def test_record_and_load_roundtrip(self, capture_dir):
+    def test_record_and_load_roundtrip(self, shared_capture_dir):
         """Record synthetic input, stop, reload, and verify events round-trip."""
-        duration = 3  # seconds
-
-        input_stop = threading.Event()
-        cycles = [0]
-
-        with Recorder(capture_dir, task_description="Integration test") as rec:
-            # Wait until listeners + writers are actually up (cold CI runners
-            # can take several seconds; a fixed sleep races the startup).
-            assert rec.wait_for_ready(timeout=120), "recorder failed to start"
-
-            # Generate synthetic input in background thread
-            def run_input():
-                cycles[0] = _generate_synthetic_input(duration, input_stop)
-
-            t = threading.Thread(target=run_input, daemon=True)
-            t.start()
-            time.sleep(duration)
-            input_stop.set()
-            t.join(timeout=5)
-
         # --- Verify capture loads correctly ---
-        capture = CaptureSession.load(capture_dir)
+        capture = CaptureSession.load(shared_capture_dir)
 
         assert capture.task_description == "Integration test"
         assert capture.platform != ""
@@ -165,11 +213,12 @@ class TestRecorderIntegration:
         assert capture.screen_size[1] > 0
 
         raw = capture.raw_events()
-        actions = list(capture.actions())
+        # Tally actions as they stream out instead of holding them all
+        action_types = Counter(a.type for a in capture.actions())
 
         # We injected clicks, moves, and key presses — should have events
         assert len(raw) > 0, "No raw events captured"
-        assert len(actions) > 0, "No processed actions produced"
+        assert action_types.total() > 0, "No processed actions produced"
 
         # Check event types are present
         raw_types = {e.type for e in raw}
@@ -177,10 +226,6 @@ class TestRecorderIntegration:
             f"Expected mouse events, got: {raw_types}"
         )
 
-        action_types = Counter(a.type for a in actions)
-        # Should have at least some click or type actions
-        assert len(action_types) > 0
-
         capture.close()
 
     @pytest.mark.skipif(_NO_INPUT_INJECTION, reason=_INJECTION_SKIP_REASON)
@@ -197,11 +242,13 @@ class TestRecorderIntegration:
                 assert rec.wait_for_ready(timeout=120), "recorder failed to start"
 
                 def run_input():
-                    _generate_synthetic_input(1, input_stop)
+                    _generate_synthetic_input(5, input_stop)
 
+                # Stop as soon as a handful of events are in; only the
+                # round-trip is under test, not a fixed-length recording
                 t = threading.Thread(target=run_input, daemon=True)
                 t.start()
-                time.sleep(1)
+                assert rec.wait_for_events(10, timeout=5), "recorder saw no input"
                 input_stop.set()
                 t.join(timeout=5)
 
@@ -243,15 +290,7 @@ class TestRecorderIntegration:
         """Test that memory growth during recording is bounded."""
         duration = 3
         input_stop = threading.Event()
-        memory_samples = []
-        mem_stop = threading.Event()
-
-        mem_thread = threading.Thread(
-            target=_sample_memory,
-            args=(os.getpid(), 0.25, memory_samples, mem_stop),
-            daemon=True,
-        )
-        mem_thread.start()
+        start_mb, _ = _tree_memory_mb(os.getpid())
 
         with Recorder(capture_dir, task_description="Memory test") as rec:
             assert rec.wait_for_ready(timeout=120), "recorder failed to start"
@@ -265,60 +304,34 @@ class TestRecorderIntegration:
             input_stop.set()
             t.join(timeout=5)
 
-        mem_stop.set()
-        mem_thread.join(timeout=2)
-
-        assert len(memory_samples) >= 2, "Not enough memory samples"
+            # Peaks must be read while the writer processes are still alive
+            stop_mb, peak_mb = _tree_memory_mb(os.getpid())
 
-        total_mb = [s["total_mb"] for s in memory_samples]
-        growth = total_mb[-1] - total_mb[0]
+        end_mb, _ = _tree_memory_mb(os.getpid())
+        growth = end_mb - start_mb
+        if peak_mb is not None:
+            during = f"peak={peak_mb:.1f}"
+        else:
+            during = f"rss before stop={stop_mb:.1f}, no peak on this platform"
 
         # Memory growth should be < 500 MB for a short recording
         assert growth < 500, (
-            f"Memory grew {growth:.1f} MB (start={total_mb[0]:.1f}, "
-            f"end={total_mb[-1]:.1f}, peak={max(total_mb):.1f})"
+            f"Memory grew {growth:.1f} MB (start={start_mb:.1f}, "
+            f"end={end_mb:.1f}, {during})"
         )
 
-    def test_db_file_created(self, capture_dir):
+    def test_db_file_created(self, shared_capture_dir):
         """Test that recording.db is created in the capture directory."""
-        input_stop = threading.Event()
-
-        with Recorder(capture_dir, task_description="DB test") as rec:
-            assert rec.wait_for_ready(timeout=120), "recorder failed to start"
-
-            def run_input():
-                _generate_synthetic_input(1, input_stop)
-
-            t = threading.Thread(target=run_input, daemon=True)
-            t.start()
-            time.sleep(1)
-            input_stop.set()
-            t.join(timeout=5)
-
-        db_path = Path(capture_dir) / "recording.db"
-        assert db_path.exists(), f"recording.db not found in {capture_dir}"
+        db_path = Path(shared_capture_dir) / "recording.db"
+        assert db_path.exists(), f"recording.db not found in {shared_capture_dir}"
         assert db_path.stat().st_size > 0, "recording.db is empty"
 
     @pytest.mark.skipif(_NO_INPUT_INJECTION, reason=_INJECTION_SKIP_REASON)
-    def test_event_throughput(self, capture_dir):
+    def test_event_throughput(self, shared_capture_dir):
         """Test that event capture rate is reasonable."""
-        duration = 3
-        input_stop = threading.Event()
-        cycles = [0]
-
-        with Recorder(capture_dir, task_description="Throughput test") as rec:
-            assert rec.wait_for_ready(timeout=120), "recorder failed to start"
-
-            def run_input():
-                cycles[0] = _generate_synthetic_input(duration, input_stop)
-
-            t = threading.Thread(target=run_input, daemon=True)
-            t.start()
-            time.sleep(duration)
-            input_stop.set()
-            t.join(timeout=5)
+        duration = SHARED_DURATION
 
-        capture = CaptureSession.load(capture_dir)
+        capture = CaptureSession.load(shared_capture_dir)
         raw = capture.raw_events()
         capture.close()
 
@@ -17,6 +17,10 @@ from PIL import Image
 from openadapt_capture import recorder as recorder_module
 from openadapt_capture import utils, video
 
+# Frames for the 2x1 _small_stream tests; stage_frame only reads them
+_RED = Image.new("RGB", (2, 1), "red")
+_BLUE = Image.new("RGB", (2, 1), "blue")
+
 
 @pytest.fixture(autouse=True)
 def _init_timestamp():
@@ -397,16 +401,14 @@ def test_direct_stream_preserves_pts_timing_without_png_staging(tmp_path, monkey
     monkeypatch.setattr(video.subprocess, "Popen", popen)
     monkeypatch.setattr(video, "_decode_first_frame_png", lambda *_args, **_kwargs: _png_bytes())
 
-    red = Image.new("RGB", (2, 1), color="red")
-    blue = Image.new("RGB", (2, 1), color="blue")
-    stage.stage_frame(red, 0)
-    stage.stage_frame(blue, 3)
+    stage.stage_frame(_RED, 0)
+    stage.stage_frame(_BLUE, 3)
     stage.close()
 
     assert len(processes) == 1
     process = processes[0]
-    red_bytes = red.tobytes()
-    blue_bytes = blue.tobytes()
+    red_bytes = _RED.tobytes()
+    blue_bytes = _BLUE.tobytes()
     assert bytes(process.pipe.data) == red_bytes * 3 + blue_bytes
     assert process.pipe.closed is True
     assert "-f" in process.command
@@ -442,7 +444,7 @@ def test_successful_direct_encode_is_verified_and_atomically_promoted(tmp_path,
     _install_fake_popen(monkeypatch, process)
     monkeypatch.setattr(video, "_decode_first_frame_png", lambda *_args, **_kwargs: _png_bytes())
 
-    stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+    stage.stage_frame(_RED, 0)
     stage.close()
 
     assert output.read_bytes().startswith(b"\x00\x00\x00\x08ftyp")
@@ -462,14 +464,12 @@ def test_direct_stream_normalizes_nonzero_initial_pts(tmp_path, monkeypatch):
     process = _FakeProcess(stage._encode_command())
     _install_fake_popen(monkeypatch, process)
     monkeypatch.setattr(video, "_decode_first_frame_png", lambda *_args, **_kwargs: _png_bytes())
-    red = Image.new("RGB", (2, 1), "red")
-    blue = Image.new("RGB", (2, 1), "blue")
 
-    stage.stage_frame(red, 100)
-    stage.stage_frame(blue, 103)
+    stage.stage_frame(_RED, 100)
+    stage.stage_frame(_BLUE, 103)
     stage.close()
 
-    assert bytes(process.pipe.data) == red.tobytes() * 3 + blue.tobytes()
+    assert bytes(process.pipe.data) == _RED.tobytes() * 3 + _BLUE.tobytes()
     assert video._read_timing_box(output) == (
         Fraction(24),
         [(0, 0.0), (3, 3 / 24)],
@@ -493,7 +493,7 @@ def test_failed_direct_encode_retains_partial_and_never_promotes_output(tmp_path
     stage.partial_path.write_bytes(b"incomplete")
     _install_fake_popen(monkeypatch, process)
 
-    stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+    stage.stage_frame(_RED, 0)
     with pytest.raises(video.FFmpegEncodingError, match="encoder failed"):
         stage.close()
 
@@ -514,7 +514,7 @@ def test_direct_encode_timeout_is_bounded_and_fail_loud(tmp_path, monkeypatch):
     process = _FakeProcess(stage._encode_command(), timeout=True)
     _install_fake_popen(monkeypatch, process)
 
-    stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+    stage.stage_frame(_RED, 0)
     with pytest.raises(video.FFmpegEncodingError, match="timed out"):
         stage.close()
     assert process._killed is True
@@ -537,7 +537,7 @@ def test_direct_encode_broken_pipe_is_fail_loud(tmp_path, monkeypatch):
     )
     _install_fake_popen(monkeypatch, process)
 
-    stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+    stage.stage_frame(_RED, 0)
     with pytest.raises(video.FFmpegEncodingError, match="codec crashed"):
         stage.close()
     assert process._killed is True
@@ -558,12 +558,11 @@ def test_direct_encode_retries_partial_pipe_writes(tmp_path, monkeypatch):
     )
     _install_fake_popen(monkeypatch, process)
     monkeypatch.setattr(video, "_decode_first_frame_png", lambda *_args, **_kwargs: _png_bytes())
-    frame = Image.new("RGB", (2, 1), "red")
 
-    stage.stage_frame(frame, 0)
+    stage.stage_frame(_RED, 0)
     stage.close()
 
-    assert bytes(process.pipe.data) == frame.tobytes()
+    assert bytes(process.pipe.data) == _RED.tobytes()
     assert video._read_timing_box(output) == (Fraction(24), [(0, 0.0)])
 
 
@@ -587,7 +586,7 @@ def test_direct_encode_worker_start_failure_reaps_process(tmp_path, monkeypatch)
         video.FFmpegEncodingError,
         match="Could not start FFmpeg input worker",
     ):
-        stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+        stage.stage_frame(_RED, 0)
     assert process._killed is True
     assert process.returncode == -9
     assert stage._process is None
@@ -608,7 +607,7 @@ def test_direct_encode_zero_length_pipe_write_fails_loudly(tmp_path, monkeypatch
     )
     _install_fake_popen(monkeypatch, process)
 
-    stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+    stage.stage_frame(_RED, 0)
     with pytest.raises(video.FFmpegEncodingError, match="no write progress"):
         stage.close()
     assert process._killed is True
@@ -628,7 +627,7 @@ def test_direct_encode_stdin_close_failure_reaps_process(tmp_path, monkeypatch):
     )
     _install_fake_popen(monkeypatch, process)
 
-    stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+    stage.stage_frame(_RED, 0)
     with pytest.raises(video.FFmpegEncodingError, match="stdin close failed"):
         stage.close()
     assert process._killed is True
@@ -649,7 +648,7 @@ def test_direct_encode_bounded_stderr_tail_does_not_block(tmp_path, monkeypatch)
     )
     _install_fake_popen(monkeypatch, process)
 
-    stage.stage_frame(Image.new("RGB", (2, 1), "red"), 0)
+    stage.stage_frame(_RED, 0)
     with pytest.raises(video.FFmpegEncodingError, match="final encoder error"):
         stage.close()
 
@@ -0,0 +1,252 @@
+"""Tests for the HTML viewer's frame encoding helpers."""
+
+from __future__ import annotations
+
+import base64
+import sys
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image, features
+
+from openadapt_capture.visualize import html as html_mod
+from openadapt_capture.visualize.html import (
+    _compact_event,
+    _image_to_base64,
+    _images_to_base64,
+    _iter_file_base64,
+    create_html,
+)
+
+
+def _decode(data: bytes) -> Image.Image:
+    image = Image.open(BytesIO(base64.b64decode(data)))
+    image.load()
+    return image
+
+
+def test_jpeg_frames_are_progressive():
+    image = Image.effect_noise((64, 48), 40).convert("RGB")
+    decoded = _decode(_image_to_base64(image))
+    assert decoded.format == "JPEG"
+    assert decoded.info.get("progressive")
+    assert decoded.size == (64, 48)
+
+
+@pytest.mark.skipif(not features.check("webp"), reason="Pillow built without WebP")
+def test_webp_frames():
+    image = Image.new("RGBA", (32, 32), (255, 0, 0, 128))
+    decoded = _decode(_image_to_base64(image, quality=80, fmt="webp"))
+    assert decoded.format == "WEBP"
+    assert decoded.mode == "RGB"
+
+
+def test_jpeg_source_downscaled_to_exact_size():
+    buf = BytesIO()
+    Image.effect_noise((203, 101), 40).convert("RGB").save(buf, format="JPEG")
+    encoded = _images_to_base64([Image.open(BytesIO(buf.getvalue()))], scale=0.3)
+    assert _decode(encoded[0]).size == (60, 30)
+
+
+def test_duplicate_frames_share_encoding():
+    a = Image.effect_noise((32, 32), 10).convert("RGB")
+    b = Image.effect_noise((32, 32), 90).convert("RGB")
+    encoded = _images_to_base64([a, None, a.copy(), b])
+    assert encoded[1] == b""
+    assert encoded[0] is encoded[2]
+    assert encoded[0] != encoded[3]
+
+
+def test_frames_encoded_in_bounded_batches(monkeypatch):
+    batches = []
+    encode_batch = html_mod._encode_frame_batch
+
+    def record_batch(images, *args, **kwargs):
+        batches.append(len(images))
+        return encode_batch(images, *args, **kwargs)
+
+    monkeypatch.setattr(html_mod, "_encode_frame_batch", record_batch)
+    images = [Image.new("RGB", (4, 4), (6 * i, 0, 0)) for i in range(40)]
+    encoded = _images_to_base64(iter(images))
+    assert batches == [html_mod._ENCODE_BATCH_SIZE, 40 - html_mod._ENCODE_BATCH_SIZE]
+    reds = [_decode(data).getpixel((0, 0))[0] for data in encoded]
+    assert all(abs(red - 6 * i) <= 2 for i, red in enumerate(reds))
+
+
+def test_process_pool_matches_serial_encoding(monkeypatch):
+    # Keep JPEG off the torchvision path so the pool branch is exercised
+    monkeypatch.setitem(sys.modules, "torch", None)
+    pooled = []
+    encode_parallel = html_mod._encode_frames_parallel
+
+    def record_pool(images, *args):
+        pooled.append(len(images))
+        return encode_parallel(images, *args)
+
+    monkeypatch.setattr(html_mod, "_encode_frames_parallel", record_pool)
+    images = [Image.effect_noise((16, 16), 10 + i).convert("RGB") for i in range(20)]
+    serial = _images_to_base64(images)
+    assert pooled == []
+    assert _images_to_base64(images, workers=2) == serial
+    assert pooled == [20]
+
+
+class _FakeAction:
+    def __init__(self, capture: "_FakeCapture", i: int) -> None:
+        self._capture = capture
+        self._i = i
+        self.timestamp = 100.0 + i
+        self.type = "mouse.singleclick"
+        self.event = SimpleNamespace(x=1.0, y=2.0, button="left")
+
+    @property
+    def screenshot(self) -> Image.Image:
+        self._capture.fetches += 1
+        return self._capture.images[self._i]
+
+
+class _FakeCapture:
+    """Minimal stand-in for CaptureSession that counts screenshot fetches."""
+
+    def __init__(self, capture_dir: Path, n: int = 3) -> None:
+        self.id = "fake"
+        self.capture_dir = capture_dir
+        self.duration = float(n)
+        self.screen_size = (32, 24)
+        self.video_path = None
+        self.fetches = 0
+        self._jpeg_cache: dict[tuple, bytes] = {}
+        self.images = [Image.effect_noise((32, 24), 20 + i).convert("RGB") for i in range(n)]
+
+    def actions(self):
+        return (_FakeAction(self, i) for i in range(len(self.images)))
+
+
+def test_repeat_render_reuses_cached_frames(tmp_path):
+    capture = _FakeCapture(tmp_path)
+    first = create_html(capture)
+    assert capture.fetches == 3
+
+    assert create_html(capture) == first
+    assert capture.fetches == 3
+
+    assert create_html(capture, frame_quality=50) != first
+    assert create_html(capture, use_cache=False) == first
+    assert capture.fetches == 9
+
+
+def test_max_events_sampling_keeps_first_and_last(tmp_path):
+    capture = _FakeCapture(tmp_path, n=10)
+    create_html(capture, max_events=3)
+    assert capture.fetches == 3
+    assert sorted(key[0] for key in capture._jpeg_cache) == [100.0, 104.0, 109.0]
+
+
+def test_split_assets_links_shared_files(tmp_path):
+    output = tmp_path / "viewer.html"
+    create_html(_FakeCapture(tmp_path), output=output, split_assets=True)
+    page = output.read_text()
+    assert '<link rel="stylesheet" href="viewer.css">' in page
+    assert '<script src="viewer.js"></script>' in page
+    assert "function updateDisplay" not in page
+    assert "function updateDisplay" in (tmp_path / "viewer.js").read_text()
+    assert (tmp_path / "viewer.css").stat().st_size > 0
+
+    inline = create_html(_FakeCapture(tmp_path), split_assets=True)
+    assert "function updateDisplay" in inline
+
+
+def test_frame_files_written_beside_output(tmp_path):
+    capture = _FakeCapture(tmp_path)
+    capture.images[2] = capture.images[0]
+    output = tmp_path / "viewer.html"
+    create_html(capture, output=output, mode="frame_files")
+    page = output.read_text()
+    assert "const frameFiles = true;" in page
+    assert 'const frameData = ["viewer_frames/00000.jpg","viewer_frames/00001.jpg",' in page
+    files = sorted((tmp_path / "viewer_frames").iterdir())
+    assert [f.name for f in files] == ["00000.jpg", "00001.jpg"]
+    assert Image.open(files[0]).size == (32, 24)
+
+    assert "const frameFiles = false;" in create_html(_FakeCapture(tmp_path), mode="frame_files")
+
+
+def test_audio_sidecars_named_per_viewer(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    for name in ("a", "b"):
+        capture_dir = tmp_path / name
+        capture_dir.mkdir()
+        (capture_dir / "audio.wav").write_bytes(f"audio {name}".encode())
+        create_html(_FakeCapture(capture_dir), output=out / f"{name}.html", include_audio=True)
+
+    for name in ("a", "b"):
+        assert (out / f"{name}_audio.wav").read_bytes() == f"audio {name}".encode()
+        assert f'src="{name}_audio.wav"' in (out / f"{name}.html").read_text()
+    assert not (out / "audio.wav").exists()
+
+
+def test_video_seek_sidecars_named_per_viewer(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    captures = {}
+    for name in ("a", "b"):
+        capture_dir = tmp_path / name
+        capture_dir.mkdir()
+        capture = captures[name] = _FakeCapture(capture_dir)
+        capture.video_path = capture_dir / "video.mp4"
+        capture.video_path.write_bytes(f"video {name}".encode())
+        capture.video_start_time = 99.5
+        create_html(capture, output=out / f"{name}.html", mode="video_seek")
+
+    for name, capture in captures.items():
+        assert capture.fetches == 0
+        assert (out / f"{name}_video.mp4").read_bytes() == f"video {name}".encode()
+        page = (out / f"{name}.html").read_text()
+        assert f'<video id="frame-video" src="{name}_video.mp4"' in page
+    assert not (out / "video.mp4").exists()
+
+    with pytest.raises(ValueError, match="no video"):
+        create_html(_FakeCapture(tmp_path), mode="video_seek")
+
+
+def test_frame_files_share_equal_encodings(tmp_path):
+    frame = _image_to_base64(Image.new("RGB", (4, 4), (0, 128, 0)))
+    urls = html_mod._write_frame_files(
+        [frame, b"", bytes(bytearray(frame))], tmp_path / "viewer.html", "jpeg"
+    )
+    assert urls == [b"viewer_frames/00000.jpg", b"", b"viewer_frames/00000.jpg"]
+    assert len(list((tmp_path / "viewer_frames").iterdir())) == 1
+
+
+def test_compact_event():
+    event = {
+        "index": 4,
+        "time": 1.23456,
+        "type": "mouse.scroll",
+        "x": 10.126,
+        "y": None,
+        "button": None,
+        "dx": 0.0,
+        "dy": -3.0,
+    }
+    assert _compact_event(event) == {"t": 1235, "e": "mouse.scroll", "x": 10.13, "dy": -3.0}
+
+
+def test_file_base64_chunks_concatenate(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_mod, "_AUDIO_CHUNK_SIZE", 6)
+    data = bytes(range(256)) * 3 + b"tail"
+    path = tmp_path / "audio.flac"
+    path.write_bytes(data)
+    assert b"".join(_iter_file_base64(path)) == base64.b64encode(data)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"frame_format": "png"}, {"mode": "frames"}],
+)
+def test_create_html_rejects_unknown_options(kwargs):
+    with pytest.raises(ValueError):
+        create_html("/nonexistent", **kwargs)